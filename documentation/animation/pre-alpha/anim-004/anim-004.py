@@ -3,18 +3,27 @@
 # $ python3 documentation/images/pre-alpha/wip-001.py --output documentation/images/pre-alpha/wip-001.png
 
 
-import math
-import argparse
+import sys
 import drawBot as db
-import pytweening as pt
-from fontTools.ttLib import TTFont
 from datetime import datetime
 
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.fonts import LazyFont
+from renatools.frames import render_animation
+from renatools.outlines import draw_text
+from renatools.timeline import Timeline
+from renatools.cli import parse_args
+from renatools.easing import sin_loop
+from renatools.drawing import draw_grid, draw_center_lines, new_page
+
 
 # Width, Height, Margin, Unit, Frames
 W, H, M, U, F = 1080, 1920, 20, 20, 50
 MAIN_FONT_PATH = "fonts/RenaVF.ttf"
 MAIN_TEXT_OPSZ = 144
+# The main text is drawn from cached outlines, with these OpenType features
+MAIN_FEATURES = {"dlig": False}
 CURRENT_DATE = datetime.now()
 FORMATTED_DATE = CURRENT_DATE.strftime("%d-%m-%Y")
 GRID_VIEW = False
@@ -22,77 +31,42 @@ GRID_VIEW = False
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args(animation=True)
 
 
 # FontTools docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(MAIN_FONT_PATH)
+ttFont = LazyFont(MAIN_FONT_PATH)
 
 
 # Draws a grid
 def grid():
     db.stroke(1, 1, 1, 0.125)
     db.strokeWidth(2)
-    step_x = 0
-    step_y = 0
-    increment_x, increment_y = U, U
-    db.rect(M, M, W - (M * 2), H - (M * 2))
-    for x in range(49):
-        db.polygon((M + step_x, M), (M + step_x, H - M))
-        step_x += increment_x
-    for y in range(49):
-        db.polygon((M, M + step_y), (W - M, M + step_y))
-        step_y += increment_y
+    draw_grid(W, H, M, U, 49, 49, center=False)
     db.stroke(1, 0, 0, 0.5)
     db.fill(None)
-    db.polygon((W / 2, 0), (W / 2, H))
-    db.polygon((0, H / 2), (W, H / 2))
+    draw_center_lines(W, H)
     #db.rect(M, M+(U*8), W-(M*2), H-(M*2)-(U*16))
 
 
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
-
-
-def sin_loop(x):
-    # Scale the input to the range [0, 2π] and shift by -π/2
-    scaled_input = 2 * math.pi * (x % 1) - (math.pi / 2)
-    # Calculate the sine of the scaled input
-    return (math.sin(scaled_input) + 1) / 2
-
-
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
 def draw_background():
-    db.newPage(W, H)
-    db.fill(0.025)
-    db.fill(0.03)
-    db.rect(-2, -2, W + 2, H + 2)
-    if GRID_VIEW:
-        grid()
-    else:
-        pass
+    new_page(W, H, 0.03, grid if GRID_VIEW else None)
 
 
 # Set font and style before animation
-varWght = 0
-#step = -1
-step = 0
-phase = 0
 r,g,b = 0.75,0.75,0.75
 TEXT_001 = "Font.Garden"
 
+# Every frame's values, worked out up front for the whole animation
+timeline = Timeline.loop(F-1, 0.02)
+timeline.add("ypos", "easeInOutExpo", 40, 66, wave=sin_loop)
+timeline.add("xpos", "easeInOutExpo", 12, 42, wave=sin_loop)
+timeline.add("wght", "easeInOutQuart", 400, 700, wave=sin_loop, snap=(699, 700))
 
-# Main Animation Loop
-#for frame in range(6):
-for frame in range(F-1):
+
+# Draw one frame of the animation, the frame state only depends on "frame"
+def draw_frame(frame):
     # Main Text
     draw_background()
     
@@ -120,23 +94,18 @@ for frame in range(F-1):
     #varWght = remap(pt.linear(step),0,1,400,700)
     #varWght = remap(pt.easeInOutCubic(step),0,1,400,700)
     
-    ypos = remap(pt.easeInOutExpo(sin_loop(step)),0,1,40,66)
-    xpos = remap(pt.easeInOutExpo(sin_loop(step)),0,1,12,42)
-    
-    varWght = remap(pt.easeInOutQuart(sin_loop(step)),0,1,400,700)
-    if varWght >= 699:
-        varWght = 700
+    ypos, xpos, varWght = timeline.values(frame, "ypos", "xpos", "wght")
     db.fontVariations(wght=varWght)
+    variations = {"opsz": MAIN_TEXT_OPSZ, "wght": varWght}
     
     db.fontSize(180*4)
     db.fill(0.9, 0.1, 0.0)
-    db.text("a", (U*xpos, H/2), align="center")
+    draw_text("a", (U*xpos, H/2), MAIN_FONT_PATH, 180*4, variations, MAIN_FEATURES, align="center")
     db.fontSize(180)
     db.fill(0.95)
-    db.text(TEXT_001, (W/2, M+(U*ypos)), align="center")
+    draw_text(TEXT_001, (W/2, M+(U*ypos)), MAIN_FONT_PATH, 180, variations, MAIN_FEATURES, align="center")
 
 
-    step += 0.02
 
     # Auxillary text
     #db.fill(0.5)
@@ -156,6 +125,8 @@ for frame in range(F-1):
     #db.polygon((M, M+(U*46)), (W-M, M+(U*46)))
 
 
-db.saveImage(args.output)
-print("DrawBot: Done\n")
+# Main Animation Loop
+if __name__ == "__main__":
+    render_animation(draw_frame, range(F-1), args, frame_key=timeline.frame_key)
+    print("DrawBot: Done\n")
 
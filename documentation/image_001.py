@@ -4,18 +4,18 @@
 # $ cd my-font
 # $ python3 documentation/image1.py --output documentation/image1.png
 
-import argparse
-
 # Import moduels from the Python Standard Library: https://docs.python.org/3/library/
-import subprocess
+import sys
 
 # Import moduels from external python packages: https://pypi.org/
 from drawbot_skia.drawbot import *
 from fontTools.misc.fixedTools import floatToFixedToStr
-from fontTools.ttLib import TTFont
-
-# import sys
 
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.cli import parse_args
+from renatools.fonts import LazyFont
+from renatools.gitinfo import git_info
 
 # Constants, these are the main "settings" for the image
 WIDTH, HEIGHT, MARGIN, FRAMES = 4096, 4096, 256, 1
@@ -31,20 +31,17 @@ GRID_VIEW = True  # Toggle this for a grid overlay
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args()
 
-# Load the font with the parts of fonttools that are imported with the line:
-# from fontTools.ttLib import TTFont
+# Load the font, its tables are only read when they are used (see renatools/fonts.py)
 # Docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(FONT_PATH)
+ttFont = LazyFont(FONT_PATH)
 
 # Constants that are worked out dynamically
-MY_URL = subprocess.check_output("git remote get-url origin", shell=True).decode()
-MY_HASH = subprocess.check_output("git rev-parse --short HEAD", shell=True).decode()
-FONT_NAME = ttFont["name"].getDebugName(4)
-FONT_VERSION = "v%s" % floatToFixedToStr(ttFont["head"].fontRevision, 16)
+MY_URL = git_info()["remote"] or "https://github.com/fontgarden/rena"
+MY_HASH = git_info()["short_hash"]
+FONT_NAME = ttFont.debug_name(4)
+FONT_VERSION = "v%s" % floatToFixedToStr(ttFont.font_revision, 16)
 
 
 # Draws a grid
@@ -64,19 +61,12 @@ def grid():
     polygon((0, HEIGHT / 2), (WIDTH, HEIGHT / 2))
 
 
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
-
-
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
+# With "--scale" the page is smaller and everything is drawn scaled down
+# (drawbot-skia has no imageResolution for saveImage())
 def draw_background():
-    newPage(WIDTH, HEIGHT)
+    newPage(round(WIDTH * args.scale), round(HEIGHT * args.scale))
+    scale(args.scale)
     fill(0.2)
     fill(0.025)
     rect(-2, -2, WIDTH + 2, HEIGHT + 2)
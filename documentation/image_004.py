@@ -2,12 +2,16 @@
 # of your font's git repository. For example, from a Unix terminal:
 # $ python3 documentation/image_001.py --output documentation/image_001.png
 
-import argparse
+import sys
 import subprocess
 
 import drawbot_skia.drawbot as db
 from fontTools.misc.fixedTools import floatToFixedToStr
-from fontTools.ttLib import TTFont
+
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.cli import parse_args
+from renatools.fonts import LazyFont
 
 # Constants, these are the main "settings" for the image
 WIDTH, HEIGHT, MARGIN, FRAMES = 4096, 4096, 256, 1
@@ -19,14 +23,11 @@ GRID_VIEW = True  # Toggle this for a grid overlay
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args()
 
-# Load the font with the parts of fonttools that are imported with the line:
-# from fontTools.ttLib import TTFont
+# Load the font, its tables are only read when they are used (see renatools/fonts.py)
 # Docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(MAIN_FONT_PATH)
+ttFont = LazyFont(MAIN_FONT_PATH)
 
 
 # Draws a grid
@@ -48,19 +49,12 @@ def grid():
     db.polygon((0, HEIGHT / 2), (WIDTH, HEIGHT / 2))
 
 
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
-
-
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
+# With "--scale" the page is smaller and everything is drawn scaled down
+# (drawbot-skia has no imageResolution for saveImage())
 def draw_background():
-    db.newPage(WIDTH, HEIGHT)
+    db.newPage(round(WIDTH * args.scale), round(HEIGHT * args.scale))
+    db.scale(args.scale)
     db.fill(0.2)
     db.fill(0.025)
     db.rect(-2, -2, WIDTH + 2, HEIGHT + 2)
@@ -2,12 +2,17 @@
 # of your font's git repository. For example, from a Unix terminal:
 # $ python3 documentation/image_001.py --output documentation/image_001.png
 
-import argparse
+import sys
 import subprocess
 
 import drawBot as db
 from fontTools.misc.fixedTools import floatToFixedToStr
-from fontTools.ttLib import TTFont
+
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.cli import parse_args
+from renatools.drawing import draw_grid, new_page, save_image
+from renatools.fonts import LazyFont
 
 # Constants, these are the main "settings" for the image
 WIDTH, HEIGHT, MARGIN, FRAMES = 4096, 4096, 256, 1
@@ -19,14 +24,11 @@ GRID_VIEW = True  # Toggle this for a grid overlay
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args()
 
-# Load the font with the parts of fonttools that are imported with the line:
-# from fontTools.ttLib import TTFont
+# Load the font, its tables are only read when they are used (see renatools/fonts.py)
 # Docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(MAIN_FONT_PATH)
+ttFont = LazyFont(MAIN_FONT_PATH)
 
 
 # Draws a grid
@@ -35,40 +37,12 @@ def grid():
     db.stroke(1, 0, 0, 0.25)
     db.fill(None)
     db.strokeWidth(2)
-    step_x = 0
-    step_y = 0
-    increment_x, increment_y = MARGIN / 2, MARGIN / 2
-    db.rect(MARGIN, MARGIN, WIDTH - (MARGIN * 2), HEIGHT - (MARGIN * 2))
-    for x in range(61):
-        db.polygon((MARGIN + step_x, MARGIN), (MARGIN + step_x, HEIGHT - MARGIN))
-        step_x += increment_x
-    for y in range(29):
-        db.polygon((MARGIN, MARGIN + step_y), (WIDTH - MARGIN, MARGIN + step_y))
-        step_y += increment_y
-    db.polygon((WIDTH / 2, 0), (WIDTH / 2, HEIGHT))
-    db.polygon((0, HEIGHT / 2), (WIDTH, HEIGHT / 2))
-
-
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
+    draw_grid(WIDTH, HEIGHT, MARGIN, MARGIN / 2, 61, 29)
 
 
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
 def draw_background():
-    db.newPage(WIDTH, HEIGHT)
-    db.fill(0.2)
-    db.fill(0.025)
-    db.rect(-2, -2, WIDTH + 2, HEIGHT + 2)
-    if GRID_VIEW:
-        grid()
-    else:
-        pass
+    new_page(WIDTH, HEIGHT, 0.025, grid if GRID_VIEW else None)
 
 
 # Draw main text
@@ -108,6 +82,6 @@ if __name__ == "__main__":
     draw_background()
     draw_main_text()
     # Save output, using the "--output" flag location
-    db.saveImage(args.output)
+    save_image(args.output, args.scale)
     # Print done in the terminal
     print("DrawBot: Done")
@@ -2,12 +2,18 @@
 # of your font's git repository. For example, from a Unix terminal:
 # $ python3 documentation/image_001.py --output documentation/image_001.png
 
-import argparse
+import sys
 import subprocess
 
 import drawBot as db
 from fontTools.misc.fixedTools import floatToFixedToStr
-from fontTools.ttLib import TTFont
+
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.cli import parse_args
+from renatools.drawing import draw_grid, save_image
+from renatools.fonts import LazyFont
+from renatools.textlayout import draw_text_box
 
 # Constants, these are the main "settings" for the image
 WIDTH, HEIGHT, MARGIN, FRAMES = 4096, 4096, 256, 1
@@ -19,14 +25,11 @@ GRID_VIEW = True  # Toggle this for a grid overlay
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args()
 
-# Load the font with the parts of fonttools that are imported with the line:
-# from fontTools.ttLib import TTFont
+# Load the font, its tables are only read when they are used (see renatools/fonts.py)
 # Docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(MAIN_FONT_PATH)
+ttFont = LazyFont(MAIN_FONT_PATH)
 
 
 # Draws a grid
@@ -35,28 +38,7 @@ def grid():
     db.stroke(0)
     db.fill(None)
     db.strokeWidth(2)
-    step_x = 0
-    step_y = 0
-    increment_x, increment_y = MARGIN / 2, MARGIN / 2
-    db.rect(MARGIN, MARGIN, WIDTH - (MARGIN * 2), HEIGHT - (MARGIN * 2))
-    for x in range(61):
-        db.polygon((MARGIN + step_x, MARGIN), (MARGIN + step_x, HEIGHT - MARGIN))
-        step_x += increment_x
-    for y in range(29):
-        db.polygon((MARGIN, MARGIN + step_y), (WIDTH - MARGIN, MARGIN + step_y))
-        step_y += increment_y
-    db.polygon((WIDTH / 2, 0), (WIDTH / 2, HEIGHT))
-    db.polygon((0, HEIGHT / 2), (WIDTH, HEIGHT / 2))
-
-
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
+    draw_grid(WIDTH, HEIGHT, MARGIN, MARGIN / 2, 61, 29)
 
 
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
@@ -89,15 +71,19 @@ def draw_main_text():
     db.font(MAIN_FONT_PATH)
     db.fontSize(512 + 32)
     db.fontSize(64)
-    db.textBox(
+    draw_text_box(
         "The problem of monetizing digital content is reproducible information is effectively infinite in supply, leaving it impossible to price, free like air. Primitive attempts at digital monetization try to create an artificial scarcity through paywalls and DRM, technically ineffective against any piracy but backed by socialized pressure and threats of legal action. These models of course restrict the free flow of information and suppress the memetic cultural nature of fonts as an art form. NFT’s are an alternative form of creating artificial digital scarcity, so it’s easy to make the intuitive leap that they also negatively limit free information. However, by changing the value proposition of digital goods from a scarcity based on limiting information access to one based on provable provenance, they have no need to rely on gatekeeping access to NFT content to secure value. Digital scarcity instituted by legal infrastructure was an awkward, artificial, and ethically problematic intervention on the free flow of information; NFTs managing scarcity as trustless bookkeeping allows accessibility to be achieved without undermining production incentives. NFT’s solve the problem of trustless digital deeds of ownership, making the need to conflate ownership with content accessibility in copyable digital media outmoded—and with it, convoluted and invasive DRM solutions, unclear licensing rights and likely one day, paywalling altogether.",
         (MARGIN, MARGIN, MARGIN * 6, MARGIN * 14),
+        MAIN_FONT_PATH,
+        64,
         align="left",
     )
     db.fontSize(32)
-    db.textBox(
+    draw_text_box(
         "The problem of monetizing digital content is reproducible information is effectively infinite in supply, leaving it impossible to price, free like air. Primitive attempts at digital monetization try to create an artificial scarcity through paywalls and DRM, technically ineffective against any piracy but backed by socialized pressure and threats of legal action. These models of course restrict the free flow of information and suppress the memetic cultural nature of fonts as an art form. NFT’s are an alternative form of creating artificial digital scarcity, so it’s easy to make the intuitive leap that they also negatively limit free information. However, by changing the value proposition of digital goods from a scarcity based on limiting information access to one based on provable provenance, they have no need to rely on gatekeeping access to NFT content to secure value. Digital scarcity instituted by legal infrastructure was an awkward, artificial, and ethically problematic intervention on the free flow of information; NFTs managing scarcity as trustless bookkeeping allows accessibility to be achieved without undermining production incentives. NFT’s solve the problem of trustless digital deeds of ownership, making the need to conflate ownership with content accessibility in copyable digital media outmoded—and with it, convoluted and invasive DRM solutions, unclear licensing rights and likely one day, paywalling altogether.",
         (MARGIN * 8, MARGIN, MARGIN * 6, MARGIN * 14),
+        MAIN_FONT_PATH,
+        32,
         align="left",
     )
 
@@ -125,6 +111,6 @@ if __name__ == "__main__":
     draw_background()
     draw_main_text()
     # Save output, using the "--output" flag location
-    db.saveImage(args.output)
+    save_image(args.output, args.scale)
     # Print done in the terminal
     print("DrawBot: Done")
@@ -2,11 +2,16 @@
 # $ git clone https://github.com/fontgarden/rena && cd rena
 # $ python3 documentation/images/pre-alpha/wip-001.py --output documentation/images/pre-alpha/wip-001.png
 
-import argparse
+import sys
 import drawBot as db
-from fontTools.ttLib import TTFont
 from datetime import datetime
 
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.cli import parse_args
+from renatools.drawing import draw_grid, new_page, save_image
+from renatools.fonts import LazyFont
+
 # Width, Height, Margin, Unit, Frames
 W, H, M, U, F = 4096, 4096, 512, 64, 1
 MAIN_FONT_PATH = "fonts/RenaVF.ttf"
@@ -17,54 +22,25 @@ GRID_VIEW = False
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args()
 
 # FontTools docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(MAIN_FONT_PATH)
+ttFont = LazyFont(MAIN_FONT_PATH)
 
 
 # Draws a grid
 def grid():
     db.stroke(1, 1, 1, 0.15)
     db.strokeWidth(2)
-    step_x = 0
-    step_y = 0
-    increment_x, increment_y = U, U
-    db.rect(M, M, W - (M * 2), H - (M * 2))
-    for x in range(49):
-        db.polygon((M + step_x, M), (M + step_x, H - M))
-        step_x += increment_x
-    for y in range(49):
-        db.polygon((M, M + step_y), (W - M, M + step_y))
-        step_y += increment_y
-    db.polygon((W / 2, 0), (W / 2, H))
-    db.polygon((0, H / 2), (W, H / 2))
+    draw_grid(W, H, M, U, 49, 49)
     db.stroke(1, 0, 0, 1.0)
     db.fill(None)
     db.rect(M, M+(U*8), W-(M*2), H-(M*2)-(U*16))
 
 
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
-
-
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
 def draw_background():
-    db.newPage(W, H)
-    db.fill(0.025)
-    db.rect(-2, -2, W + 2, H + 2)
-    if GRID_VIEW:
-        grid()
-    else:
-        pass
+    new_page(W, H, 0.025, grid if GRID_VIEW else None)
 
 
 # Draw image
@@ -101,5 +77,5 @@ if __name__ == "__main__":
     print("\n﷽")
     draw_background()
     draw_image()
-    db.saveImage(args.output)
+    save_image(args.output, args.scale)
     print("DrawBot: Done\n")
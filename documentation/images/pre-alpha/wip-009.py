@@ -1,10 +1,15 @@
-import math
-import argparse
+import sys
 import drawBot as db
 import pytweening as pt
-from fontTools.ttLib import TTFont
 from datetime import datetime
 
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.background import draw_blurred_image
+from renatools.cli import parse_args
+from renatools.drawing import draw_grid, save_image
+from renatools.fonts import LazyFont
+
 
 # Width, Height, Margin, Unit, Frames
 W, H, M, U, F = 1080*2, 1080*2, 120, 60, 50
@@ -17,13 +22,11 @@ GRID_VIEW = False
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args()
 
 
 # FontTools docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(MAIN_FONT_PATH)
+ttFont = LazyFont(MAIN_FONT_PATH)
 
 
 # Draws a grid
@@ -31,38 +34,9 @@ def grid():
     db.fill(None)
     db.stroke(0)
     db.strokeWidth(1)
-    step_x = 0
-    step_y = 0
-    increment_x, increment_y = U, U
-    db.rect(M, M, W - (M * 2), H - (M * 2))
-    for x in range(36*2):
-        db.polygon((M + step_x, M), (M + step_x, H - M))
-        step_x += increment_x
-    for y in range(36*2):
-        db.polygon((M, M + step_y), (W - M, M + step_y))
-        step_y += increment_y
+    draw_grid(W, H, M, U, 36*2, 36*2)
     #db.stroke(0.9, 0.0, 0.0, 1.0)
     #db.fill(None)
-    db.polygon((W / 2, 0), (W / 2, H))
-    db.polygon((0, H / 2), (W, H / 2))
-
-
-# Remap input range to VF axis range
-# This is useful for animation
-# (E.g. sinewave(-1,1) to wght(100,900))
-def remap(value, inputMin, inputMax, outputMin, outputMax):
-    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
-    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
-    valueScaled = float(value - inputMin) / float(inputSpan)
-    return outputMin + (valueScaled * outputSpan)
-
-
-# For looping animations
-def sin_loop(x):
-    # Scale the input to the range [0, 2π] and shift by -π/2
-    scaled_input = 2 * math.pi * (x % 1) - (math.pi / 2)
-    # Calculate the sine of the scaled input
-    return (math.sin(scaled_input) + 1) / 2
 
 
 # Draw the page/frame and a grid if "GRID_VIEW" is set to "True"
@@ -73,21 +47,24 @@ def draw_background():
     db.rect(-2, -2, W + 2, H + 2)
  
 
-    im = db.ImageObject()
-    with im:
-        # set a size for the image
-        db.size(2160*2, 2160*2)
-        # draw something
-        #db.fill(0.1)
-        #db.rect(0, 0, 2160, 2160)
-        db.fill(0.8, 0.4, 0)
-        db.rect(0, 0, 1080*2, 1080*2)
-        db.fill(1, 0, 0)
-        db.rect(0, 0, 540*2, 540*2)
-    im.gaussianBlur(radius=300)
-    #im.boxBlur(radius=100)
+    # Blurred color field, rendered once and then reused from the cache
     db.blendMode("color")
-    db.image(im, (-300, -300))
+    draw_blurred_image(
+        (-300, -300),
+        (2160*2, 2160*2),
+        ops=[
+            #("fill", 0.1),
+            #("rect", 0, 0, 2160, 2160),
+            ("fill", 0.8, 0.4, 0),
+            ("rect", 0, 0, 1080*2, 1080*2),
+            ("fill", 1, 0, 0),
+            ("rect", 0, 0, 540*2, 540*2),
+        ],
+        filters=[
+            ("gaussianBlur", {"radius": 300}),
+            #("boxBlur", {"radius": 100}),
+        ],
+    )
     db.blendMode("clear")
     
     #db.fill(0.6)
@@ -133,6 +110,6 @@ db.text("behind a wall of encrypted energy.”", (M+(U*(1)), M+(U*(TOP_ROW-10)))
 db.text("—Michael Saylor", (M+(U*(1)), M+(U*(TOP_ROW-14))), align="left")
 
 
-db.saveImage(args.output)
+save_image(args.output, args.scale)
 print("DrawBot: Done\n")
 
@@ -1,13 +1,21 @@
 # RENDER THIS DOCUMENT WITH DRAWBOT: http://www.drawbot.com
 # Unit Space: 72dpi (dots per inch)
-import math
-import subprocess
-import argparse
+import sys
 import drawBot as db
 import pytweening as pt
-from fontTools.ttLib import TTFont
 from datetime import datetime
 
+# Make "documentation/renatools" importable, run this script from the repo root
+sys.path.insert(0, "documentation")
+from renatools.cli import parse_args
+from renatools.fonts import LazyFont
+from renatools.gitinfo import git_info
+from renatools.drawing import draw_grid
+from renatools.frames import render_pages
+from renatools.proof import axis_matrix, block, block_label, draw_blocks, flow_pages, side_by_side
+from renatools.sweep import sweep_locations
+from renatools.spacing import proof_characters, spacing_lines, spacing_columns
+
 
 # CONSTANTS
 W = 792     # Width
@@ -16,38 +24,26 @@ M = 36      # Margin
 U = 9       # Unit
 CURRENT_DATE = datetime.now()
 FORMATTED_DATE = CURRENT_DATE.strftime("%d.%m.%Y")
-MY_HASH_SHORT = subprocess.check_output("git rev-parse --short HEAD", shell=True).decode()
-MY_HASH = subprocess.check_output("git rev-parse --verify HEAD", shell=True).decode()
+MY_HASH_SHORT = git_info()["short_hash"]
+MY_HASH = git_info()["hash"]
 RENA_VF = "fonts/RenaVF.ttf"
 GRID_VIEW = False 
 
 
 # Handel the "--output" flag
 # For example: $ python3 documentation/image1.py --output documentation/image1.png
-parser = argparse.ArgumentParser()
-parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
-args = parser.parse_args()
+args = parse_args(pages=True)
 
 
 # FontTools docs Link: https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
-ttFont = TTFont(RENA_VF)
+ttFont = LazyFont(RENA_VF)
 
 
 # Draws a grid
 def grid():
     db.stroke(1, 0, 0, 0.5)
     db.strokeWidth(0.5)
-    STEP_X, STEP_Y = 0, 0
-    INCREMENT_X, INCREMENT_Y = M/2, M/2
-    db.rect(M, M, W-(M*2), H-(M*2))
-    for x in range(41):
-        db.polygon((M+STEP_X, M), (M+STEP_X, H-M))
-        STEP_X += INCREMENT_X
-    for y in range(31):
-        db.polygon((M, M+STEP_Y), (W-M, M+STEP_Y))
-        STEP_Y += INCREMENT_Y
-    db.polygon((W/2, 0), (W/2, H))
-    db.polygon((0, H/2), (W, H/2))
+    draw_grid(W, H, M, M/2, 41, 31)
 
 
 # Draw page info
@@ -99,261 +95,126 @@ def new_page():
 #    print(eachFontName)
 
 
-def create_spacing_strings_upper(characters):
-    spacing_strings = "" 
-    for char in characters:
-        spacing_string = "HH"+char+"OHO"+char+"OO\n"
-        spacing_strings = spacing_strings+spacing_string
-    return spacing_strings
-
-
-def create_spacing_strings_lower(characters):
-    spacing_strings = "" 
-    for char in characters:
-        spacing_string = "nn"+char+"ono"+char+"oo\n"
-        spacing_strings = spacing_strings+spacing_string
-    return spacing_strings
-
-
-def create_spacing_strings_number(characters):
-    spacing_strings = "" 
-    for char in characters:
-        spacing_string = "11"+char+"010"+char+"00\n"
-        spacing_strings = spacing_strings+spacing_string
-    return spacing_strings
-
-
 # Constants
 LOREM_IPSUM = "Lorem Ipsum is simply dummy text of the printing and typesetting industry. Lorem Ipsum has been the industry's standard dummy text ever since the 1500s, when an unknown printer took a galley of type and scrambled it to make a type specimen book. It has survived not only five centuries, but also the leap into electronic typesetting, remaining essentially unchanged. It was popularised in the 1960s with the release of Letraset sheets containing Lorem Ipsum passages, and more recently with desktop publishing software like Aldus PageMaker including versions of Lorem Ipsum."
 BITCOIN = "A purely peer-to-peer version of electronic cash would allow online payments to be sent directly from one party to another without going through a financial institution. Digital signatures provide part of the solution, but the main benefits are lost if a trusted third party is still required to prevent double-spending. We propose a solution to the double-spending problem using a peer-to-peer network. The network timestamps transactions by hashing them into an ongoing chain of hash-based proof-of-work, forming a record that cannot be changed without redoing the proof-of-work. The longest chain not only serves as proof of the sequence of events witnessed, but proof that it came from the largest pool of CPU power. As long as a majority of CPU power is controlled by nodes that are not cooperating to attack the network, they'll generate the longest chain and outpace attackers. The network itself requires minimal structure. Messages are broadcast on a best effort basis, and nodes can leave and rejoin the network at will, accepting the longest proof-of-work chain as proof of what happened while they were gone. Commerce on the Internet has come to rely almost exclusively on financial institutions serving as trusted third parties to process electronic payments. While the system works well enough for most transactions, it still suffers from the inherent weaknesses of the trust based model. Completely non-reversible transactions are not really possible, since financial institutions cannot avoid mediating disputes. The cost of mediation increases transaction costs, limiting the minimum practical transaction size and cutting off the possibility for small casual transactions, and there is a broader cost in the loss of ability to make non-reversible payments for nonreversible services. With the possibility of reversal, the need for trust spreads. Merchants must be wary of their customers, hassling them for more information than they would otherwise need. A certain percentage of fraud is accepted as unavoidable. These costs and payment uncertainties can be avoided in person by using physical currency, but no mechanism exists to make payments over a communications channel without a trusted party. What is needed is an electronic payment system based on cryptographic proof instead of trust, allowing any two willing parties to transact directly with each other without the need for a trusted third party. Transactions that are computationally impractical to reverse would protect sellers from fraud, and routine escrow mechanisms could easily be implemented to protect buyers. In this paper, we propose a solution to the double-spending problem using a peer-to-peer distributed timestamp server to generate computational proof of the chronological order of transactions. The system is secure as long as honest nodes collectively control more CPU power than any cooperating group of attacker nodes. "
 
 
-chars_to_proof_lower = "abcdefghijklmnopqrstuvwxyz"
-chars_to_proof_upper = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-chars_to_proof_number = "1234567890-+=_)(*%$#@!.:"
-#chars_to_proof_lower = "abcdefghijklmnopqrstuvwxyz"
-#chars_to_proof_upper = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-#chars_to_proof_number = "1234567890-+=_)(*%$#@!.:"
-spacing_strings_upper = create_spacing_strings_upper(chars_to_proof_upper)
-spacing_strings_lower = create_spacing_strings_lower(chars_to_proof_lower)
-spacing_strings_number = create_spacing_strings_number(chars_to_proof_number)
-#spacing_strings_upper_extra = create_spacing_strings_upper(chars_to_proof_upper_extra)
-#spacing_strings_lower_extra = create_spacing_strings_lower(chars_to_proof_lower_extra)
-#spacing_strings_number_extra = create_spacing_strings_number(chars_to_proof_number_extra)
-
-
-# Start making pages
-db.newDrawing()
-
-
-new_page() #--------------------------------------------------#
-page_number = 0
-draw_page_info(page_number, 0)
-db.font(RENA_VF)
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 144)
-db.fontSize(92)
-db.stroke(None)
-db.fill(0)
-db.text("Rena Typeface", (M+(U*0), M+(U*46)))
-db.text("Print Proof", (M+(U*0), M+(U*36)))
-db.text(FORMATTED_DATE, (M+(U*0), M+(U*26)))
-db.text("Git: "+MY_HASH_SHORT, (M+(U*0), M+(U*6)))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 1)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 144)
-db.text("wght:700—opsz:144—72pt", (M+(U*0), M+(U*55)))
-
-db.fontSize(72)
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 144)
-db.text("abcdefghijklmnopq", (M+(U*0), M+(U*46)))
-db.text("rstuvwxyzß.,:;-–—”!?", (M+(U*0), M+(U*36)))
-db.text("ABCDEFGHIJKLMN", (M+(U*0), M+(U*26)))
-db.text("OPQRSTUVWXYZ&", (M+(U*0), M+(U*16)))
-db.text("1234567890₿$¢€¥", (M+(U*0), M+(U*6)))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 1)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 144)
-db.text("wght:550—opsz:144—72pt", (M+(U*0), M+(U*55)))
-
-db.fontSize(72)
-db.fontVariations(wght = 550)
-db.fontVariations(opsz = 144)
-db.text("abcdefghijklmnopq", (M+(U*0), M+(U*46)))
-db.text("rstuvwxyzß.,:;-–—”!?", (M+(U*0), M+(U*36)))
-db.text("ABCDEFGHIJKLMN", (M+(U*0), M+(U*26)))
-db.text("OPQRSTUVWXYZ&", (M+(U*0), M+(U*16)))
-db.text("1234567890₿$¢€¥", (M+(U*0), M+(U*6)))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 1)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 144)
-db.text("wght:400—opsz:144—72pt", (M+(U*0), M+(U*55)))
-
-db.fontSize(72)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 144)
-db.text("abcdefghijklmnopq", (M+(U*0), M+(U*46)))
-db.text("rstuvwxyzß.,:;-–—”!?", (M+(U*0), M+(U*36)))
-db.text("ABCDEFGHIJKLMN", (M+(U*0), M+(U*26)))
-db.text("OPQRSTUVWXYZ&", (M+(U*0), M+(U*16)))
-db.text("1234567890₿$¢€¥", (M+(U*0), M+(U*6)))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 2)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:400—opsz:144", (M+(U*0), M+(U*55)))
-db.text("wght:700—opsz:144", (M+(U*40), M+(U*55)))
-
-db.fontSize(14)
-db.lineHeight(14.85)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 144)
-db.textBox(spacing_strings_upper, (M+(U*0), M+(U*3), U*12, U*49))
-db.textBox(spacing_strings_lower, (M+(U*13), M+(U*3), U*12, U*49))
-db.textBox(spacing_strings_number, (M+(U*24), M+(U*3), U*12, U*49))
-
-
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 144)
-db.textBox(spacing_strings_upper, (M+(U*40), M+(U*3), U*12, U*49))
-db.textBox(spacing_strings_lower, (M+(U*53), M+(U*3), U*12, U*49))
-db.textBox(spacing_strings_number, (M+(U*64), M+(U*3), U*12, U*49))
-
-#fill(1,0,0)
-#rect(MARGIN+(UNIT*42), MARGIN+(UNIT*4), UNIT*38, UNIT*44)
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 3)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:400—opsz:14—12:13", (M+(U*0), M+(U*55)))
-db.text("wght:400—opsz:14—10:11", (M+(U*42), M+(U*55)))
-
-db.fontSize(12)
-db.lineHeight(13)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.textBox(BITCOIN*2, (M+(U*0), M+(U*4), U*38, U*48))
-
-db.fontSize(10)
-db.lineHeight(11)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.textBox(BITCOIN*2, (M+(U*42), M+(U*4), U*38, U*48))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 3)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:700—opsz:14—12:13", (M+(U*0), M+(U*55)))
-db.text("wght:700—opsz:14—10:11", (M+(U*42), M+(U*55)))
-
-db.fontSize(12)
-db.lineHeight(13)
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 14)
-db.textBox(BITCOIN*2, (M+(U*0), M+(U*4), U*38, U*48))
-
-db.fontSize(10)
-db.lineHeight(11)
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 14)
-db.textBox(BITCOIN*2, (M+(U*42), M+(U*4), U*38, U*48))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 3)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:700—opsz:72—24:25", (M+(U*0), M+(U*55)))
-
-db.fontSize(24)
-db.lineHeight(25)
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 72)
-db.textBox(BITCOIN*2, (M+(U*0), M+(U*4), U*72, U*48))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 3)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:400—opsz:72—24:25", (M+(U*0), M+(U*55)))
-
-db.fontSize(24)
-db.lineHeight(25)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 72)
-db.textBox(BITCOIN*2, (M+(U*0), M+(U*4), U*72, U*48))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 3)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:700—opsz:144", (M+(U*0), M+(U*55)))
-
-db.fontVariations(wght = 700)
-db.fontVariations(opsz = 144)
-db.fontSize(72)
-db.text("Northwest Techno", (M+(U*0), M+(U*46)))
-db.text("Graphic Design", (M+(U*0), M+(U*38)))
-db.text("THE DESIGN OF THE", (M+(U*0), M+(U*22)))
-db.text("UNIX SYSTEM", (M+(U*0), M+(U*14)))
-db.text("GRID PROGRAM", (M+(U*0), M+(U*6)))
-
-
-new_page() #--------------------------------------------------#
-page_number += 1
-draw_page_info(page_number, 3)
-db.fontSize(12)
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 14)
-db.text("wght:400—opsz:144", (M+(U*0), M+(U*55)))
-
-db.fontVariations(wght = 400)
-db.fontVariations(opsz = 144)
-db.fontSize(72)
-db.text("Northwest Techno", (M+(U*0), M+(U*46)))
-db.text("Graphic Design", (M+(U*0), M+(U*38)))
-db.text("THE DESIGN OF THE", (M+(U*0), M+(U*22)))
-db.text("UNIX SYSTEM", (M+(U*0), M+(U*14)))
-db.text("GRID PROGRAM", (M+(U*0), M+(U*6)))
-
-# Saving and post-processing #--------------------------------#
-db.saveImage(args.output)
-print("DrawBot: Done :-)")
+# Spacing strings for every character in the font, GF Latin first
+GLYPH_FILTER = "sources/CustomFilter_GF_Latin_All.plist"
+SPACING_LEADING = 14.85
+
+
+# Lines of the character set and headline pages, at (x, y) in grid units
+CHARACTER_SET = [
+    ("abcdefghijklmnopq", (0, 46)),
+    ("rstuvwxyzß.,:;-–—”!?", (0, 36)),
+    ("ABCDEFGHIJKLMN", (0, 26)),
+    ("OPQRSTUVWXYZ&", (0, 16)),
+    ("1234567890₿$¢€¥", (0, 6)),
+]
+HEADLINES = [
+    ("Northwest Techno", (0, 46)),
+    ("Graphic Design", (0, 38)),
+    ("THE DESIGN OF THE", (0, 22)),
+    ("UNIX SYSTEM", (0, 14)),
+    ("GRID PROGRAM", (0, 6)),
+]
+
+# Axis locations to proof, add values here to proof more of the design space
+# (E.g. opsz=(14, 72, 144) for every weight at every optical size)
+CHARACTER_SET_LOCATIONS = axis_matrix(wght=(700, 550, 400), opsz=(144,))
+SPACING_LOCATIONS = axis_matrix(wght=(400, 700), opsz=(144,))
+TEXT_LOCATIONS = axis_matrix(wght=(400, 700), opsz=(14,))
+LARGE_TEXT_LOCATIONS = axis_matrix(wght=(700, 400), opsz=(72,))
+HEADLINE_LOCATIONS = axis_matrix(wght=(700, 400), opsz=(144,))
+
+
+# The small text above the samples, naming their style
+def labels(*labels, opsz=14):
+    return block({"wght": 400, "opsz": opsz}, 12, lines=labels)
+
+
+# All pages of the proof, see renatools/proof.py
+#
+# Only the script that renders lays out the pages, the workers get the page
+# they draw passed to them (see render_pages())
+def proof_pages():
+    character_set_locations = CHARACTER_SET_LOCATIONS
+    # With "--sweep" the character set is proofed across the whole design space,
+    # more densely where the interpolation bends, and at least at the usual locations
+    if args.sweep:
+        character_set_locations = sweep_locations(
+            RENA_VF, text="".join(line for line, _ in CHARACTER_SET), include=CHARACTER_SET_LOCATIONS,
+        )
+    spacing = spacing_columns(spacing_lines(proof_characters(ttFont, GLYPH_FILTER)), int((U*49) // SPACING_LEADING))
+
+    pages = []
+    pages.append({"section": 0, "blocks": [
+        block({"wght": 700, "opsz": 144}, 92, lines=[
+            ("Rena Typeface", (0, 46)),
+            ("Print Proof", (0, 36)),
+            (FORMATTED_DATE, (0, 26)),
+            ("Git: "+MY_HASH_SHORT, (0, 6)),
+        ]),
+    ]})
+
+    for location in character_set_locations:
+        pages.append({"section": 1, "blocks": [
+            labels((block_label(location, 72), (0, 55)), opsz=144),
+            block(location, 72, lines=CHARACTER_SET),
+        ]})
+
+    # Spacing strings, two locations side by side on a page, three columns each
+    for left, right in zip(SPACING_LOCATIONS[::2], SPACING_LOCATIONS[1::2]):
+        for start in range(0, len(spacing), 3):
+            columns = spacing[start:start+3]
+            pages.append({"section": 2, "blocks": [
+                labels((block_label(left), (0, 55)), (block_label(right), (40, 55))),
+                block(left, 14, leading=SPACING_LEADING, boxes=[
+                    (column, (x, 3, 12, 49)) for column, x in zip(columns, (0, 13, 24))
+                ]),
+                block(right, 14, leading=SPACING_LEADING, boxes=[
+                    (column, (x, 3, 12, 49)) for column, x in zip(columns, (40, 53, 64))
+                ]),
+            ]})
+
+    # Text samples at 12:13 and 10:11 side by side, the whole text on as
+    # many pages as it needs
+    for location in TEXT_LOCATIONS:
+        pages.extend(side_by_side(
+            flow_pages(BITCOIN*2, [(0, 4, 38, 48)], RENA_VF, U, location, 12, leading=13),
+            flow_pages(BITCOIN*2, [(42, 4, 38, 48)], RENA_VF, U, location, 10, leading=11),
+            labels=labels((block_label(location, 12, 13), (0, 55)), (block_label(location, 10, 11), (42, 55))),
+        ))
+
+    # The whole text at 24:25, on as many pages as it needs
+    for location in LARGE_TEXT_LOCATIONS:
+        pages.extend(flow_pages(
+            BITCOIN*2, [(0, 4, 72, 48)], RENA_VF, U, location, 24, leading=25,
+            labels=labels((block_label(location, 24, 25), (0, 55))),
+        ))
+
+    for location in HEADLINE_LOCATIONS:
+        pages.append({"section": 3, "blocks": [
+            labels((block_label(location), (0, 55))),
+            block(location, 72, lines=HEADLINES),
+        ]})
+
+    return pages
+
+
+# Draw one page of the proof from its number and the page from proof_pages()
+def draw_page(page_number, page):
+    new_page()
+    draw_page_info(page_number, page["section"])
+    db.stroke(None)
+    db.fill(0)
+    draw_blocks(page["blocks"], RENA_VF, M, U)
 
 
+# Render the pages in parallel and merge them into one PDF #--#
+if __name__ == "__main__":
+    pages = proof_pages()
+    render_pages(draw_page, range(len(pages)), args.output, workers=args.workers, resume=args.resume, specs=dict(enumerate(pages)))
+    print("DrawBot: Done :-)")
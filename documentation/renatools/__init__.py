@@ -0,0 +1,3 @@
+# Shared helpers for the Rena documentation scripts.
+# The scripts are run from the root level of the Rena git repository, so they
+# make this package importable with: sys.path.insert(0, "documentation")
@@ -0,0 +1,117 @@
+# Cached blurred backgrounds and static plates
+#
+# The blurred color fields behind the images are a 4320×4320 ImageObject
+# with a gaussianBlur() and a boxBlur() on top, and they never change between
+# runs. The finished raster is stored as a PNG in the cache, keyed on the
+# image size, the drawing operations and the filters, and reused by every
+# page, frame and run that asks for the same background.
+#
+# The same goes for the parts of an animation that are identical in every
+# frame (the background fill, the grid, boxes that don't move): they are
+# drawn once into a "static plate" PNG, and every frame starts from the
+# plate and only draws what moves on top of it.
+
+import os
+import inspect
+
+import drawBot as db
+
+from renatools.build import script_inputs, input_hashes
+from renatools.cache import cache_path, cache_key, read_json, write_json, atomic_write
+
+
+# Bump this to throw away the cached backgrounds
+CACHE_VERSION = 1
+
+# The plates are drawn again when these change, E.g. the grid in drawing.py
+PLATE_MODULES = ("documentation/renatools/background.py", "documentation/renatools/drawing.py")
+
+# Backgrounds and plates already looked up in this process
+_blurred_images = {}
+_static_plates = {}
+
+
+# Draw the image with "ops" and "filters" into an ImageObject
+#
+# "ops" are DrawBot calls as tuples: ("fill", 1, 0, 0), ("rect", 0, 0, 1080, 1080)
+# "filters" are ImageObject filters: ("gaussianBlur", {"radius": 300})
+def _draw_image_object(size, ops, filters):
+    im = db.ImageObject()
+    with im:
+        db.size(*size)
+        for name, *arguments in ops:
+            getattr(db, name)(*arguments)
+    for name, options in filters:
+        getattr(im, name)(**options)
+    return im
+
+
+# Save an ImageObject as a PNG, the filters can move the origin of
+# the image, so it is drawn back at its offset to keep all of it
+def _save_image_object(im, path):
+    width, height = im.size()
+    offset_x, offset_y = im.offset()
+    # Drawing inside an ImageObject works in a separate drawing,
+    # so the current page of the script isn't touched
+    with db.ImageObject():
+        db.size(width, height)
+        db.image(im, (-offset_x, -offset_y))
+        db.saveImage(path)
+
+
+# Get the path and offset of a cached blurred image,
+# it is only rendered when it isn't in the cache yet
+def blurred_image(size, ops=(), filters=()):
+    key = cache_key(CACHE_VERSION, list(size), [list(op) for op in ops], [list(f) for f in filters])
+    if key in _blurred_images:
+        return _blurred_images[key]
+    image_path = cache_path("backgrounds", key + ".png")
+    info_path = cache_path("backgrounds", key + ".json")
+    info = read_json(info_path)
+    if info is None or not os.path.exists(image_path):
+        im = _draw_image_object(size, ops, filters)
+        atomic_write(image_path, lambda path: _save_image_object(im, path))
+        info = {"offset": list(im.offset())}
+        write_json(info_path, info)
+    _blurred_images[key] = image_path, tuple(info["offset"])
+    return _blurred_images[key]
+
+
+# Draw a cached blurred image at "position", like db.image() does with an ImageObject
+def draw_blurred_image(position, size, ops=(), filters=(), alpha=1):
+    image_path, (offset_x, offset_y) = blurred_image(size, ops, filters)
+    x, y = position
+    db.image(image_path, (x + offset_x, y + offset_y), alpha=alpha)
+
+
+# Get the path of the static plate drawn by "draw_static()" on a canvas of
+# "size", it is only rendered when it isn't in the cache yet
+#
+# "draw_static" draws on the current page (without a db.newPage()). The plate
+# is rendered again whenever the script that defines it or one of its inputs
+# changes (the renatools modules it imports, like drawing.py for the grid, and
+# the fonts and images it mentions, see renatools/build.py). Pass the values
+# it depends on that can change without editing a file as "key" (E.g. values
+# read from the command line).
+def static_plate(draw_static, size, key=()):
+    script = inspect.getsourcefile(draw_static)
+    # The render server runs edited scripts again in the same process
+    lookup = (script, os.stat(script).st_mtime_ns, draw_static.__qualname__, tuple(size), key)
+    if lookup in _static_plates:
+        return _static_plates[lookup]
+    inputs = input_hashes(sorted({*script_inputs(os.path.relpath(script)), *PLATE_MODULES}), {})
+    plate_key = cache_key(CACHE_VERSION, "plate", list(size), inputs, draw_static.__qualname__, key)
+    image_path = cache_path("plates", plate_key + ".png")
+    if not os.path.exists(image_path):
+        im = db.ImageObject()
+        with im:
+            db.size(*size)
+            draw_static()
+        atomic_write(image_path, lambda path: _save_image_object(im, path))
+    _static_plates[lookup] = image_path
+    return image_path
+
+
+# Draw the static plate of "draw_static()" at the origin of the current page
+def draw_static_plate(draw_static, size, key=()):
+    db.image(static_plate(draw_static, size, key), (0, 0))
@@ -0,0 +1,231 @@
+# Incremental build of all documentation images, proofs and animations
+#
+# Every render script in documentation/ is rendered to its output (see
+# output_path), and the files it depends on are read from its source: the
+# script itself, the renatools modules it imports, and every font or image
+# path it mentions (E.g. "fonts/RenaVF.ttf" or
+# "documentation/images/pre-alpha/flux/spoonbender-001.png"). Scripts that
+# print the commit hash also depend on the commit HEAD points to.
+# The hashes of those inputs are recorded in ".cache/renatools/build.json"
+# after a successful render, and a script is only run again when one of its
+# inputs changed or its output is missing. Independent scripts are rendered
+# at the same time.
+#
+# Run from the root level of the Rena git repository:
+#   $ sh build-docs.sh                    (everything that changed)
+#   $ sh build-docs.sh --force            (everything)
+#   $ sh build-docs.sh --dry-run          (only list what would be rendered)
+#   $ sh build-docs.sh documentation/images/pre-alpha/wip-010.py
+
+import os
+import re
+import ast
+import sys
+import glob
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from renatools.cache import cache_path, file_hash, read_json, write_json
+from renatools.gitinfo import git_environment, git_info
+
+
+DOCUMENTATION_DIR = "documentation"
+
+RENATOOLS_DIR = os.path.join(DOCUMENTATION_DIR, "renatools")
+TESTS_DIR = os.path.join(DOCUMENTATION_DIR, "tests")
+
+# Scripts whose output isn't named after the script, the way the README and
+# the committed images have them (E.g. image_008.py draws the second of its
+# two images)
+OUTPUT_OVERRIDES = {
+    "documentation/image_008.py": "documentation/image_008_002.png",
+    "documentation/image_print_006.py": "documentation/image_print_006_he.pdf",
+}
+
+# The commit HEAD points to is an input of the scripts that print it (the
+# ones that import renatools.gitinfo themselves), recorded under this name
+GIT_INPUT = "git:HEAD"
+GIT_MODULE = "renatools.gitinfo"
+
+# Bump this to render everything again on the next build
+BUILD_VERSION = 1
+
+# String constants in a script that look like one of these files are inputs
+INPUT_PATTERN = re.compile(r"^[\w.\-]+(/[\w.\-]+)+\.(ttf|otf|woff2?|png|jpe?g|gif|tiff?|pdf|svg|glyphs|plist)$", re.IGNORECASE)
+
+
+# The path of the build manifest, made when it is first needed
+def manifest_path():
+    return cache_path("build.json")
+
+
+# Every render script, sorted, without the renatools package and the tests
+def find_scripts(root=DOCUMENTATION_DIR):
+    scripts = []
+    for path in glob.glob(os.path.join(root, "**", "*.py"), recursive=True):
+        if any(os.path.commonpath([path, folder]) == folder for folder in (RENATOOLS_DIR, TESTS_DIR)):
+            continue
+        scripts.append(os.path.normpath(path))
+    return sorted(scripts)
+
+
+# Where a script writes its output, next to the script like the build-*.sh
+# scripts do: animations are ".mp4", print proofs ".pdf" and the rest ".png",
+# unless it is in OUTPUT_OVERRIDES
+def output_path(script):
+    script = os.path.relpath(script)
+    if script in OUTPUT_OVERRIDES:
+        return OUTPUT_OVERRIDES[script]
+    base = os.path.splitext(script)[0]
+    parts = script.split(os.sep)
+    if "animation" in parts:
+        return base + ".mp4"
+    if "print" in os.path.basename(script) or "print-proofs" in parts:
+        return base + ".pdf"
+    return base + ".png"
+
+
+def is_animation(script):
+    return output_path(script).endswith(".mp4")
+
+
+# The files a script depends on, from its source
+def script_inputs(script):
+    with open(script, encoding="utf-8") as f:
+        source = f.read()
+    inputs = {script}
+    output = output_path(script)
+    for node in ast.walk(ast.parse(source, script)):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if INPUT_PATTERN.match(node.value) and os.path.normpath(node.value) != output:
+                inputs.add(os.path.normpath(node.value))
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            inputs.update(_renatools_sources(node.module))
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                inputs.update(_renatools_sources(alias.name))
+    return sorted(inputs)
+
+
+# Whether the script itself imports renatools.gitinfo (E.g. image_001.py prints
+# the commit hash), renatools modules using it don't count
+def prints_git_info(script):
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), script)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == GIT_MODULE:
+            return True
+        if isinstance(node, ast.Import) and any(alias.name == GIT_MODULE for alias in node.names):
+            return True
+    return False
+
+
+def _module_path(module):
+    return os.path.join(DOCUMENTATION_DIR, *module.split(".")) + ".py"
+
+
+# Source files of a renatools module and the renatools modules it imports
+def _renatools_sources(module, seen=None):
+    seen = set() if seen is None else seen
+    path = _module_path(module)
+    if module.split(".")[0] != "renatools" or path in seen or not os.path.exists(path):
+        return seen
+    seen.add(path)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            _renatools_sources(node.module, seen)
+    return seen
+
+
+# Hashes of the input files, missing files (E.g. an image that isn't in the
+# repository yet) are recorded as None so adding them triggers a rebuild
+def input_hashes(inputs, hashes):
+    result = {}
+    for path in inputs:
+        if path not in hashes:
+            hashes[path] = file_hash(path) if os.path.exists(path) else None
+        result[path] = hashes[path]
+    return result
+
+
+# The scripts whose output is missing or whose inputs changed since the last build
+def outdated_scripts(scripts, manifest, force=False):
+    hashes = {}
+    outdated = []
+    for script in scripts:
+        inputs = input_hashes(script_inputs(script), hashes)
+        if prints_git_info(script):
+            inputs[GIT_INPUT] = git_info()["hash"]
+        entry = manifest.get(script)
+        up_to_date = (
+            not force
+            and entry is not None
+            and entry.get("version") == BUILD_VERSION
+            and entry.get("inputs") == inputs
+            and os.path.exists(output_path(script))
+        )
+        if not up_to_date:
+            outdated.append((script, inputs))
+    return outdated
+
+
+# Run one render script the way the build-*.sh scripts do,
+# always at full size (even with RENATOOLS_SCALE set for previews)
+def render(script, animation_workers=None):
+    command = [sys.executable, script, "--output", output_path(script), "--scale", "1"]
+    if animation_workers is not None and is_animation(script):
+        command += ["--workers", str(animation_workers)]
+    return subprocess.run(command, capture_output=True, text=True, env=git_environment())
+
+
+def build(scripts=None, jobs=None, force=False, dry_run=False):
+    scripts = find_scripts() if not scripts else sorted(os.path.normpath(s) for s in scripts)
+    manifest = read_json(manifest_path(), {})
+    outdated = outdated_scripts(scripts, manifest, force)
+    print(f"Build: {len(outdated)} of {len(scripts)} scripts to render")
+    if dry_run:
+        for script, _ in outdated:
+            print("  ", script, "→", output_path(script))
+        return []
+
+    jobs = jobs or os.cpu_count()
+    # The animations render their frames in a process pool of their own,
+    # share the CPUs between them when more than one script runs at a time
+    animation_workers = max(1, os.cpu_count() // jobs) if jobs > 1 else None
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(render, script, animation_workers): (script, inputs) for script, inputs in outdated}
+        for future in as_completed(futures):
+            script, inputs = futures[future]
+            result = future.result()
+            if result.returncode != 0 or not os.path.exists(output_path(script)):
+                print("Failed:", script)
+                print(result.stderr.strip()[-2000:])
+                failed.append(script)
+                continue
+            print("Rendered:", output_path(script))
+            # Record every finished script right away, so an interrupted
+            # build doesn't render it again
+            manifest[script] = {"version": BUILD_VERSION, "inputs": inputs}
+            write_json(manifest_path(), manifest)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scripts", nargs="*", metavar="SCRIPT", help="only build these scripts (default: all of documentation/)")
+    parser.add_argument("--jobs", "-j", type=int, help="how many scripts to render at the same time")
+    parser.add_argument("--force", action="store_true", help="render every script, even if nothing changed")
+    parser.add_argument("--dry-run", action="store_true", help="only list the scripts that would be rendered")
+    args = parser.parse_args()
+    failed = build(args.scripts, args.jobs, args.force, args.dry_run)
+    if failed:
+        print(f"Build: {len(failed)} scripts failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# On-disk cache shared by the documentation scripts
+#
+# Everything lives under ".cache/renatools" at the root level of the Rena git
+# repository (the scripts are run from there) and can be deleted at any time.
+
+import os
+import json
+import hashlib
+import tempfile
+
+
+CACHE_DIR = os.path.join(".cache", "renatools")
+
+
+# Path of a file or folder in the cache, the parent folder is created
+def cache_path(*parts):
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+# Hash any JSON-serializable values into a stable cache key
+def cache_key(*values):
+    data = json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+# Hash the contents of a file
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Write a file so that other processes never see it half written
+# "write" is called with the path of a temporary file in the same folder
+def atomic_write(path, write):
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    suffix = os.path.splitext(path)[1]
+    handle, temp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=suffix)
+    os.close(handle)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+# Read and write small JSON files in the cache
+def read_json(path, default=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    def write(temp_path):
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+    atomic_write(path, write)
@@ -0,0 +1,46 @@
+# Command line flags shared by the documentation scripts
+
+import os
+import argparse
+
+
+# Default for "--scale", E.g. $ RENATOOLS_SCALE=0.25 sh build-temp.sh
+SCALE_VARIABLE = "RENATOOLS_SCALE"
+
+
+# Handel the "--output" flag
+# For example: $ python3 documentation/image1.py --output documentation/image1.png
+#
+# The animation scripts (and the multi-page scripts with "pages=True") also
+# get the flags for the frame renderer (see renatools/frames.py)
+def parse_args(animation=False, pages=False):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", metavar="PNG", help="where to write the PNG file")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=float(os.environ.get(SCALE_VARIABLE, 1)),
+        help="save PNGs and frames at this fraction of the canvas size for a quick preview (PDFs are always full size)",
+    )
+    if animation or pages:
+        parser.add_argument("--workers", type=int, help="how many frames or pages to render at the same time")
+        parser.add_argument("--resume", action="store_true", help="keep the frames or pages the last render of this output finished")
+    if pages:
+        parser.add_argument("--sweep", action="store_true", help="proof the whole design space of the font (see renatools/sweep.py)")
+    if animation:
+        parser.add_argument("--stream", action="store_true", help="pipe each frame into ffmpeg as soon as it is done")
+        parser.add_argument("--frames", type=frame_range, metavar="START:END", help="only render the frames from START up to (not including) END")
+        parser.add_argument("--shard-out", metavar="DIR", help="render the frames into DIR, to be merged by renatools/shards.py, instead of the .mp4")
+        parser.add_argument("--list-frames", action="store_true", help="print the frame numbers as JSON and stop")
+    return parser.parse_args()
+
+
+# "START:END" as (START, END), either side can be left out (E.g. "25:")
+def frame_range(text):
+    start, separator, end = text.partition(":")
+    try:
+        if not separator:
+            raise ValueError(text)
+        return (int(start) if start else None, int(end) if end else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START:END, got {text!r}")
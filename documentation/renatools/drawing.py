@@ -0,0 +1,85 @@
+# Page and grid drawing shared by the DrawBot scripts
+
+import functools
+
+import drawBot as db
+
+
+# Grid as one BezierPath: the margin box, "columns" vertical and "rows"
+# horizontal lines "increment" apart, and the center cross of the page
+#
+# The path is built once per set of arguments and then reused, so drawing the
+# grid on every page or frame is a single db.drawPath() call. It is drawn with
+# the current fill and stroke, like the db.rect() and db.polygon() calls it
+# replaces.
+@functools.lru_cache(maxsize=None)
+def grid_path(width, height, margin, increment, columns, rows, center=True):
+    path = db.BezierPath()
+    path.rect(margin, margin, width - (margin * 2), height - (margin * 2))
+    for x in range(columns):
+        path.moveTo((margin + (increment * x), margin))
+        path.lineTo((margin + (increment * x), height - margin))
+    for y in range(rows):
+        path.moveTo((margin, margin + (increment * y)))
+        path.lineTo((width - margin, margin + (increment * y)))
+    if center:
+        path.appendPath(center_path(width, height))
+    return path
+
+
+# Vertical and horizontal lines through the center of the page
+@functools.lru_cache(maxsize=None)
+def center_path(width, height):
+    path = db.BezierPath()
+    path.moveTo((width / 2, 0))
+    path.lineTo((width / 2, height))
+    path.moveTo((0, height / 2))
+    path.lineTo((width, height / 2))
+    return path
+
+
+# Draws a grid
+def draw_grid(width, height, margin, increment, columns, rows, center=True):
+    db.drawPath(grid_path(width, height, margin, increment, columns, rows, center))
+
+
+# Draws the center cross on its own, for grids that use a different stroke for it
+def draw_center_lines(width, height):
+    db.drawPath(center_path(width, height))
+
+
+# Start a new page/frame filled with "fill", and call "grid" to draw a grid
+# on top (E.g. new_page(W, H, 0.03, grid if GRID_VIEW else None))
+def new_page(width, height, fill=None, grid=None):
+    db.newPage(width, height)
+    fill_page(width, height, fill, grid)
+
+
+# Fill the current page and draw the grid on top, like new_page() does
+def fill_page(width, height, fill=None, grid=None):
+    if fill is not None:
+        if isinstance(fill, tuple):
+            db.fill(*fill)
+        else:
+            db.fill(fill)
+        db.rect(-2, -2, width + 2, height + 2)
+    if grid is not None:
+        grid()
+
+
+# Vector formats are always saved at full size
+VECTOR_FORMATS = (".pdf", ".svg")
+
+
+# Save the drawing like db.saveImage() does, with bitmaps (PNG, the frames of
+# an animation) at "scale" times the size of the canvas. The geometry stays
+# the same, so a 4096×4096 canvas at scale 0.25 is a 1024×1024 preview.
+#
+# Only the rasterizing and PNG encoding get cheaper (about scale² of the
+# pixels). The drawing, text shaping and ImageObject filters (E.g. the blur
+# of renatools/background.py) still run at the full size of the canvas.
+def save_image(path, scale=1):
+    if scale == 1 or path.lower().endswith(VECTOR_FORMATS):
+        db.saveImage(path)
+    else:
+        db.saveImage(path, imageResolution=72 * scale)
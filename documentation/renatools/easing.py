@@ -0,0 +1,97 @@
+# Remap, loop and easing helpers for the documentation scripts
+#
+# Every helper works on a single number and, when NumPy is installed, on a
+# whole NumPy array of values at once (E.g. the time values of all frames).
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _is_array(value):
+    return np is not None and isinstance(value, np.ndarray)
+
+
+# Remap input range to VF axis range
+# This is useful for animation
+# (E.g. sinewave(-1,1) to wght(100,900))
+def remap(value, inputMin, inputMax, outputMin, outputMax):
+    inputSpan = inputMax - inputMin  # FIND INPUT RANGE SPAN
+    outputSpan = outputMax - outputMin  # FIND OUTPUT RANGE SPAN
+    valueScaled = (value - inputMin) / float(inputSpan)
+    return outputMin + (valueScaled * outputSpan)
+
+
+# For looping animations
+def sin_loop(x):
+    # Scale the input to the range [0, 2π] and shift by -π/2
+    if _is_array(x):
+        return (np.sin(2 * math.pi * (x % 1) - (math.pi / 2)) + 1) / 2
+    scaled_input = 2 * math.pi * (x % 1) - (math.pi / 2)
+    # Calculate the sine of the scaled input
+    return (math.sin(scaled_input) + 1) / 2
+
+
+# Transformed Sin
+def t_sin(x):
+    if _is_array(x):
+        return (np.sin(x) + 1) / 2
+    return (math.sin(x) + 1) / 2
+
+
+# Easing curves, these give the same values as the pytweening functions
+# with the same name, E.g. ease_in_out_expo() and pt.easeInOutExpo()
+def linear(n):
+    return n
+
+
+def ease_in_out_cubic(n):
+    return _ease_in_out_power(n, 3)
+
+
+def ease_in_out_quart(n):
+    return _ease_in_out_power(n, 4)
+
+
+def ease_in_out_quint(n):
+    return _ease_in_out_power(n, 5)
+
+
+def ease_in_out_expo(n):
+    if _is_array(n):
+        n = n.astype(float)
+        with np.errstate(over="ignore"):
+            eased = np.where(n < 0.5, 0.5 * 2 ** (20 * n - 10), 1 - 0.5 * 2 ** (-20 * n + 10))
+        eased[n == 0] = 0.0
+        eased[n == 1] = 1.0
+        return eased
+    if n == 0:
+        return 0.0
+    if n == 1:
+        return 1.0
+    if n < 0.5:
+        return 0.5 * 2 ** (20 * n - 10)
+    return 1 - 0.5 * 2 ** (-20 * n + 10)
+
+
+def _ease_in_out_power(n, power):
+    if _is_array(n):
+        n = n.astype(float) * 2
+        return np.where(n < 1, 0.5 * n**power, 1 - 0.5 * np.abs(n - 2) ** power)
+    n = n * 2
+    if n < 1:
+        return 0.5 * n**power
+    return 1 - 0.5 * abs(n - 2) ** power
+
+
+# The easing functions by their pytweening names, for looking them up by name
+EASING = {
+    "linear": linear,
+    "easeInOutCubic": ease_in_out_cubic,
+    "easeInOutQuart": ease_in_out_quart,
+    "easeInOutQuint": ease_in_out_quint,
+    "easeInOutExpo": ease_in_out_expo,
+}
@@ -0,0 +1,91 @@
+# Streaming ".mp4" output for the animation scripts
+#
+# Finished frames are piped straight into an ffmpeg process as PNG data, so
+# nothing has to be kept in memory until the end of the render. The ".mp4" is
+# written as a fragmented MP4, which means everything ffmpeg received before
+# a crash is still a playable video.
+
+import os
+import shutil
+import subprocess
+
+
+# Find an ffmpeg binary, either on the PATH or the one that ships with DrawBot
+def ffmpeg_path():
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import drawBot.context.tools as drawBotTools
+        from drawBot.misc import getExternalToolPath
+    except ImportError:
+        pass
+    else:
+        path = getExternalToolPath(os.path.dirname(drawBotTools.__file__), "ffmpeg")
+        if path and os.path.exists(path):
+            return path
+    raise FileNotFoundError("ffmpeg not found, install it or add it to the PATH")
+
+
+# Pipe PNG frames into ffmpeg, one frame at a time, for example:
+#
+#   with FrameEncoder("anim-005.mp4") as encoder:
+#       for path in frame_paths:
+#           encoder.write_file(path)
+#
+# The frame rate matches DrawBot's default ".mp4" frame duration of 1/10s
+class FrameEncoder:
+    def __init__(self, output, frame_rate=10, codec="libx264"):
+        self.output = output
+        self.frame_rate = frame_rate
+        self.codec = codec
+        self.frame_count = 0
+        self.process = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        command = [
+            ffmpeg_path(),
+            "-y",
+            "-loglevel", "error",
+            "-f", "image2pipe",
+            "-framerate", str(self.frame_rate),
+            "-c:v", "png",
+            "-i", "-",
+            "-c:v", self.codec,
+            # yuv420p needs an even width and height, frames rendered at a
+            # "--scale" can be odd (E.g. 0.25 × 1081), so they get a pixel more
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt", "yuv420p",
+            # Fragmented MP4: the file is playable after every fragment
+            "-movflags", "frag_keyframe+empty_moov+default_base_moof",
+            self.output,
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    # Send the data of one PNG frame to ffmpeg
+    def write(self, data):
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+        self.frame_count += 1
+
+    # Send a PNG file to ffmpeg
+    def write_file(self, path):
+        with open(path, "rb") as f:
+            self.write(f.read())
+
+    # Close the pipe and wait for ffmpeg to finish writing the ".mp4"
+    def close(self):
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        return_code = self.process.wait()
+        self.process = None
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, "ffmpeg")
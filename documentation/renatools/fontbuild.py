@@ -0,0 +1,362 @@
+# Incremental build of the variable font
+#
+# A full build runs fontmake on "sources/Rena.glyphs", but most edit/proof
+# rounds only touch the outlines or widths of one or two glyphs. After every
+# build the glyphs of the source are recorded (a hash per glyph of its
+# outlines, anchors, widths and everything else), and the next build compares
+# the source against that:
+#
+#   - nothing changed: the font is up to date
+#   - only outlines and widths of some glyphs changed: those glyphs, and the
+#     composite glyphs that use them, are compiled on their own from a cut
+#     down copy of the source, and their "glyf", "gvar" and "hmtx" entries are
+#     put into the existing font (the "HVAR" is rebuilt when a width changed)
+#   - anything else (features, kerning, anchors, unicodes, masters, glyphs
+#     added or removed, ...): a full build
+#
+# The static instances of the source ("Regular", "Bold Display", ...) are
+# cut from the variable font, each one in its own process.
+#
+# The fonts are written to "build/" and not over the committed
+# "fonts/RenaVF.ttf": that one is exported from Glyphs (its name table says
+# "Version 1.000;Glyphs 3.3 (3311)", and its name and STAT tables come from
+# Glyphs), while fontmake writes its own name and STAT tables and adds an
+# HVAR. Pass --output to build somewhere else, the static instances go into
+# a "static" folder next to it.
+#
+# Run from the root level of the Rena git repository:
+#   $ sh build-font.sh
+#   $ sh build-font.sh --full
+#   $ sh build-font.sh --instances
+#   $ sh build-font.sh --output /tmp/RenaVF.ttf
+
+import os
+import re
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from fontTools.ttLib import TTFont
+from fontTools.varLib import instancer
+
+from renatools.cache import cache_path, cache_key, file_hash, read_json, write_json, atomic_write
+from renatools.glyphs import GlyphsSource
+
+
+SOURCE_PATH = os.path.join("sources", "Rena.glyphs")
+OUTPUT_PATH = os.path.join("build", "RenaVF.ttf")
+
+# Bump this to force a full build the next time
+STATE_VERSION = 1
+
+# Top-level keys that don't end up in the font
+IGNORED_KEYS = {".appVersion", "DisplayStrings", "date", "settings", "userData"}
+# Keys of the cut down source that refer to other glyphs, the glyphs
+# compiled on their own don't need them
+PARTIAL_DROPPED_KEYS = {"classes", "featurePrefixes", "features", "kerningLTR", "kerningRTL", "kerning"}
+
+# Glyph and layer keys that don't change the compiled glyph
+IGNORED_GLYPH_KEYS = {"lastChange", "color", "note", "userData", "layers"}
+IGNORED_LAYER_KEYS = {"anchors", "width", "background", "guides", "annotations", "userData", "metricLeft", "metricRight", "metricWidth"}
+
+_LAST_CHANGE = re.compile(r'^lastChange = "[^"]*";\n', re.M)
+
+
+def state_path(output=OUTPUT_PATH):
+    return cache_path("fontbuild", cache_key(os.path.abspath(SOURCE_PATH), os.path.abspath(output)) + ".json")
+
+
+# The folder of the static instances, next to the variable font
+def static_dir(output=OUTPUT_PATH):
+    return os.path.join(os.path.dirname(output), "static")
+
+
+# Hash of the raw text of a glyph, without the "lastChange" date Glyphs
+# updates even when nothing else changes
+def _raw_hash(text):
+    return cache_key(_LAST_CHANGE.sub("", text))
+
+
+# Hashes of the parts of a glyph that end up in different tables
+def glyph_parts(glyph):
+    layers = glyph.get("layers", [])
+    return {
+        "outlines": cache_key([{k: v for k, v in layer.items() if k not in IGNORED_LAYER_KEYS} for layer in layers]),
+        "widths": cache_key([layer.get("width") for layer in layers]),
+        "anchors": cache_key([layer.get("anchors") for layer in layers]),
+        "other": cache_key({k: v for k, v in glyph.items() if k not in IGNORED_GLYPH_KEYS}),
+    }
+
+
+# Glyph names of the components used by a glyph, in any layer
+def glyph_components(glyph):
+    names = set()
+    for layer in glyph.get("layers", []):
+        for shape in layer.get("shapes", []):
+            if "ref" in shape:
+                names.add(shape["ref"])
+    return names
+
+
+# The current state of the source: a hash of everything outside of the
+# glyphs, the glyph order, and the hashes and components of every glyph
+#
+# Glyphs whose raw text didn't change since "previous" are not parsed again.
+def source_state(source, previous=None):
+    previous_glyphs = (previous or {}).get("glyphs", {})
+    top_level = [source.read(*source.top_level[key]) for key in source.keys() if key not in IGNORED_KEYS | {"glyphs"}]
+    glyphs = {}
+    for name in source.glyph_names():
+        raw = _raw_hash(source.read(*source.glyphs[name]))
+        if previous_glyphs.get(name, {}).get("raw") == raw:
+            glyphs[name] = previous_glyphs[name]
+            continue
+        glyph = source.glyph(name)
+        glyphs[name] = {"raw": raw, "parts": glyph_parts(glyph), "components": sorted(glyph_components(glyph))}
+    return {
+        "version": STATE_VERSION,
+        "global": cache_key(top_level),
+        "order": source.glyph_names(),
+        "glyphs": glyphs,
+    }
+
+
+# The glyphs that have to be compiled again, or None when it takes a full build
+def changed_glyphs(previous, current):
+    if previous is None or previous.get("version") != STATE_VERSION:
+        return None
+    if previous["global"] != current["global"] or previous["order"] != current["order"]:
+        return None
+    changed = set()
+    widths_changed = False
+    for name, glyph in current["glyphs"].items():
+        old = previous["glyphs"][name]
+        if old["raw"] == glyph["raw"]:
+            continue
+        if old["parts"]["other"] != glyph["parts"]["other"] or old["parts"]["anchors"] != glyph["parts"]["anchors"]:
+            return None
+        if old["parts"]["outlines"] != glyph["parts"]["outlines"]:
+            changed.add(name)
+        if old["parts"]["widths"] != glyph["parts"]["widths"]:
+            changed.add(name)
+            widths_changed = True
+    # Composites can be decomposed by the compiler, so they are compiled again
+    # along with the glyphs they use
+    users = {}
+    for name, glyph in current["glyphs"].items():
+        for component in glyph["components"]:
+            users.setdefault(component, set()).add(name)
+    pending = list(changed)
+    while pending:
+        for user in users.get(pending.pop(), ()):
+            if user not in changed:
+                changed.add(user)
+                pending.append(user)
+    return changed, widths_changed
+
+
+# Every glyph needed to compile "names": the glyphs and their components
+def _with_components(names, state):
+    needed = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(state["glyphs"][name]["components"])
+    return needed
+
+
+# Write a copy of the source with only the glyphs in "names", and without
+# the features, classes and kerning that refer to the other glyphs
+def write_partial_source(source, names, path):
+    parts = ["{\n"]
+    for key in source.keys():
+        if key in PARTIAL_DROPPED_KEYS:
+            continue
+        if key == "glyphs":
+            glyphs = [source.read(*source.glyphs[name]) for name in source.glyph_names() if name in names]
+            parts.append("glyphs = (\n" + ",\n".join(glyphs) + "\n);\n")
+        else:
+            parts.append(source.read(*source.top_level[key]))
+    parts.append("}\n")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+
+
+def fontmake(source_path, output_path):
+    subprocess.run(
+        ["fontmake", "-g", source_path, "-o", "variable", "--output-path", output_path],
+        check=True,
+    )
+
+
+def full_build(output=OUTPUT_PATH):
+    print("Font: full build of", SOURCE_PATH, "→", output)
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    atomic_write(output, lambda path: fontmake(SOURCE_PATH, path))
+
+
+# The name fontmake gives a glyph of the source in the font (E.g.
+# "Gcommaaccent" → "uni0122", "alef-ar.fina" → "uni0627.fina"): its
+# "production" name, or else the one from the glyph data of glyphsLib
+def production_name(source, name):
+    glyph = source.glyph(name)
+    if glyph.get("production"):
+        return glyph["production"]
+    from glyphsLib.glyphdata import get_glyph
+
+    codepoints = glyph.get("unicode", [])
+    if isinstance(codepoints, int):
+        codepoints = [codepoints]
+    return get_glyph(name, unicodes=[f"{codepoint:04X}" for codepoint in codepoints]).production_name
+
+
+# Compile "names" on their own and put them into the existing font, or do a
+# full build when they can't all be found in the fonts
+def partial_build(source, state, names, widths_changed, output=OUTPUT_PATH):
+    font = TTFont(output)
+    production_names = {production_name(source, name) for name in names}
+    if not production_names <= set(font.getGlyphOrder()):
+        print("Font: not in", output + ":", " ".join(sorted(production_names - set(font.getGlyphOrder()))))
+        full_build(output)
+        return
+    print("Font: compiling", len(names), "glyphs:", " ".join(sorted(names)))
+    work_dir = tempfile.mkdtemp(prefix="rena-font-")
+    try:
+        partial_source = os.path.join(work_dir, "Rena.glyphs")
+        partial_font = os.path.join(work_dir, "Rena-partial.ttf")
+        write_partial_source(source, _with_components(names, state), partial_source)
+        fontmake(partial_source, partial_font)
+
+        partial = TTFont(partial_font)
+        if not production_names <= set(partial.getGlyphOrder()):
+            print("Font: the glyphs compiled on their own got other names")
+            full_build(output)
+            return
+        for name in production_names:
+            font["glyf"][name] = partial["glyf"][name]
+            font["hmtx"][name] = partial["hmtx"][name]
+            if name in partial["gvar"].variations:
+                font["gvar"].variations[name] = partial["gvar"].variations[name]
+            else:
+                font["gvar"].variations.pop(name, None)
+        if widths_changed and "HVAR" in font:
+            from fontTools.varLib.hvar import add_HVAR
+
+            del font["HVAR"]
+            add_HVAR(font)
+        atomic_write(output, font.save)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# Build the font, only compiling what changed since the last build
+def build(full=False, instances=False, jobs=None, output=OUTPUT_PATH):
+    path = state_path(output)
+    previous = read_json(path)
+    source = GlyphsSource(SOURCE_PATH)
+    state = source_state(source, previous)
+
+    # The font was built or changed by something else since the last build
+    if previous is not None and previous.get("output") != (file_hash(output) if os.path.exists(output) else None):
+        previous = None
+
+    changes = None if full else changed_glyphs(previous, state)
+    if changes is None:
+        full_build(output)
+    elif not changes[0]:
+        print("Font:", output, "is up to date")
+    else:
+        partial_build(source, state, *changes, output)
+
+    state["output"] = file_hash(output)
+    # The variable font the static instances were last cut from
+    built_from = (previous or {}).get("instances")
+    if instances:
+        missing = not all(os.path.exists(path) for _, _, path in static_instances(source, static_dir(output)))
+        if full or missing or built_from != state["output"]:
+            build_instances(source, output, jobs)
+        built_from = state["output"]
+    state["instances"] = built_from
+    write_json(path, state)
+    print("Font: Done", output)
+
+
+# Turn design space coordinates (E.g. wght 104) into user space coordinates
+# (wght 400) with the "Axis Mappings" custom parameter of the source
+def user_location(source, axes_values):
+    mappings = {}
+    for parameter in source.value("customParameters", []):
+        if parameter.get("name") == "Axis Mappings":
+            mappings = parameter["value"]
+    location = {}
+    for axis, design in zip(source.value("axes"), axes_values):
+        tag = axis["tag"]
+        points = sorted((value, float(user)) for user, value in mappings.get(tag, {}).items())
+        location[tag] = _interpolate(points, design) if points else design
+    return location
+
+
+def _interpolate(points, value):
+    if value <= points[0][0]:
+        return points[0][1] + (value - points[0][0])
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if value <= x1:
+            return y0 + (y1 - y0) * (value - x0) / (x1 - x0)
+    return points[-1][1] + (value - points[-1][0])
+
+
+# The exported static instances as (name, user space location, output path),
+# in the order of the source
+def static_instances(source, folder):
+    family = source.value("familyName")
+    result = []
+    for instance in source.value("instances", []):
+        if instance.get("exports", 1) == 0 or instance.get("type") == "variable":
+            continue
+        name = instance["name"]
+        output = os.path.join(folder, f"{family}-{name.replace(' ', '')}.ttf")
+        result.append((name, user_location(source, instance["axesValues"]), output))
+    return result
+
+
+# Cut one static instance from the variable font
+def _build_instance(variable_font, location, output):
+    font = instancer.instantiateVariableFont(TTFont(variable_font), location, updateFontNames=True)
+    atomic_write(output, font.save)
+    return output
+
+
+# Cut all static instances from the variable font, in parallel
+#
+# Every instance only reads the variable font and writes its own file, and
+# the results are collected in the order of the source, so the output is the
+# same however many processes are used.
+def build_instances(source, variable_font=OUTPUT_PATH, jobs=None):
+    instances = static_instances(source, static_dir(variable_font))
+    os.makedirs(static_dir(variable_font), exist_ok=True)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_build_instance, variable_font, location, output) for _, location, output in instances]
+        for (name, location, _), future in zip(instances, futures):
+            print("Font: instance", name, location, "→", future.result())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="build the whole font, even if only a few glyphs changed")
+    parser.add_argument("--instances", action="store_true", help="also build the static instances into a static folder next to the font")
+    parser.add_argument("--jobs", "-j", type=int, help="how many instances to build at the same time")
+    parser.add_argument("--output", default=OUTPUT_PATH, help=f"where to write the variable font (default: {OUTPUT_PATH})")
+    args = parser.parse_args()
+    try:
+        build(args.full, args.instances, args.jobs, args.output)
+    except subprocess.CalledProcessError as error:
+        sys.exit(error.returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Lazily loaded fonts
+#
+# Nearly every script opens its font at the top with TTFont(), and most of
+# them never look at it again. The ones that do only need a name, the font
+# revision or the cmap. LazyFont stands in for the TTFont: that small
+# metadata comes from a summary kept in the cache for each version of the
+# font file, and fontTools is only imported, and the font only opened, when
+# the script asks for anything else (E.g. ttFont["gvar"]). The tables are
+# then decompiled one by one as they are used, like TTFont(lazy=True) does.
+#
+#   ttFont = LazyFont("fonts/RenaVF.ttf")
+#   ttFont.debug_name(4)     "Rena Regular", from the summary
+#   ttFont.getBestCmap()     {97: "a", ...}, from the summary
+#   ttFont["fvar"].axes      opens the font
+
+from renatools.cache import cache_path, cache_key, file_hash, read_json, write_json
+
+
+# Bump this to make the summaries again
+SUMMARY_VERSION = 1
+
+
+# Names, revision, units per em and cmap of the font at "path"
+def font_summary(path):
+    summary_path = cache_path("fonts", cache_key(SUMMARY_VERSION, file_hash(path)) + ".json")
+    summary = read_json(summary_path)
+    if summary is None:
+        from fontTools.ttLib import TTFont
+        with TTFont(path, lazy=True) as ttFont:
+            summary = {
+                "names": {str(record.nameID): ttFont["name"].getDebugName(record.nameID) for record in ttFont["name"].names},
+                "fontRevision": ttFont["head"].fontRevision,
+                "unitsPerEm": ttFont["head"].unitsPerEm,
+                "cmap": {str(codepoint): name for codepoint, name in ttFont.getBestCmap().items()},
+            }
+        write_json(summary_path, summary)
+    return summary
+
+
+class LazyFont:
+    def __init__(self, path):
+        self.path = path
+        self._summary = None
+        self._font = None
+
+    @property
+    def summary(self):
+        if self._summary is None:
+            self._summary = font_summary(self.path)
+        return self._summary
+
+    # The TTFont itself, opened the first time it is needed
+    @property
+    def font(self):
+        if self._font is None:
+            from fontTools.ttLib import TTFont
+            self._font = TTFont(self.path, lazy=True)
+        return self._font
+
+    # Like ttFont["name"].getDebugName(nameID)
+    def debug_name(self, nameID):
+        return self.summary["names"].get(str(nameID))
+
+    # Like ttFont["head"].fontRevision
+    @property
+    def font_revision(self):
+        return self.summary["fontRevision"]
+
+    @property
+    def units_per_em(self):
+        return self.summary["unitsPerEm"]
+
+    def getBestCmap(self):
+        return {int(codepoint): name for codepoint, name in self.summary["cmap"].items()}
+
+    # Everything else is looked up on the TTFont
+    def __getitem__(self, tag):
+        return self.font[tag]
+
+    def __contains__(self, tag):
+        return tag in self.font
+
+    def __getattr__(self, name):
+        # Not for the attributes of LazyFont itself (E.g. while unpickling)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.font, name)
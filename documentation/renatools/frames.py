@@ -0,0 +1,306 @@
+# Parallel frame rendering for the animation scripts
+#
+# An animation script defines "draw_frame(frame)", which draws one complete
+# page (including the "db.newPage") using only the frame index. Each frame is
+# rendered to its own PNG in a worker process, and the PNGs are put back
+# together in frame order as the pages of the final ".mp4".
+#
+# Multi-page documents (E.g. the print proofs) work the same way with
+# render_pages(), only with a PDF per page so the pages stay vector.
+#
+# The frames are rendered into a work folder in the cache, and every finished
+# frame is recorded there, so an interrupted render can be picked up again
+# with "--resume" instead of starting over. The folder is deleted after a
+# render that worked, unless it was started with "--resume".
+
+import os
+import json
+import shutil
+import collections
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import drawBot as db
+
+from renatools.build import script_inputs, input_hashes
+from renatools.cache import cache_path, cache_key, file_hash, read_json, write_json
+from renatools.drawing import save_image
+from renatools.encoder import FrameEncoder
+
+
+# Time value for loops that advance by "increment" every frame
+# (E.g. the "step += 0.02" loops driven by sin_loop())
+def loop_step(frame, increment=0.02, offset=0):
+    return offset + (frame * increment)
+
+
+# Time value for loops that run 0 → 1 and back to 0
+# (E.g. the "phase" loops that add and then subtract 0.04 from step)
+def ping_pong_step(frame, increment=0.04):
+    step = (frame * increment) % 2
+    if step > 1:
+        step = 2 - step
+    return step
+
+
+# Render one frame into its own drawing and save it (as a PNG or PDF), with
+# a "spec" the page is drawn from it (see render_pages())
+def _render_frame(draw_frame, frame, path, scale=1, spec=None):
+    db.newDrawing()
+    if spec is None:
+        draw_frame(frame)
+    else:
+        draw_frame(frame, spec)
+    save_image(path, scale)
+    db.endDrawing()
+    return path
+
+
+# The name of the file with the finished frames in a work folder
+CHECKPOINT_NAME = "finished.json"
+
+
+# The folder in the cache that the frames (or pages) of "output" are rendered
+# into. It is emptied when the next render of the same output starts, unless
+# that render resumes.
+def work_dir(output, scale=1, resume=False):
+    folder = os.path.dirname(cache_path("renders", cache_key(os.path.abspath(output), scale), CHECKPOINT_NAME))
+    if not resume:
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+    return folder
+
+
+# Delete the work folder after a render that worked, a render with "--resume"
+# keeps it for the next one
+def _finish_work_dir(folder, resume):
+    if not resume:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+# Hash of the script "draw" is defined in and of the files it depends on (the
+# renatools modules, fonts and images, see renatools/build.py), so a frame
+# finished before the drawing code or a font changed isn't used again
+def inputs_key(draw):
+    return cache_key(input_hashes(script_inputs(draw.__code__.co_filename), {}))
+
+
+def frame_name(frame, extension="png"):
+    return f"frame-{frame:05d}.{extension}"
+
+
+# Render "todo" ((frame, path) pairs) and yield the paths in the same order
+#
+# Only a few frames per worker are in flight at any time, so frames that are
+# finished early don't pile up while an earlier frame is still rendering.
+def _render_in_order(draw_frame, todo, workers=None, scale=1, specs=None):
+    specs = specs or {}
+    if workers == 1:
+        for frame, path in todo:
+            yield _render_frame(draw_frame, frame, path, scale, specs.get(frame))
+        return
+    workers = workers or os.cpu_count()
+    # "spawn" because AppKit, used by DrawBot, is not safe to fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = collections.deque()
+        for frame, path in todo:
+            pending.append(pool.submit(_render_frame, draw_frame, frame, path, scale, specs.get(frame)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# Render the frames into "frame_dir" and yield the image paths in frame order
+#
+# Every finished frame is written to the checkpoint file of the folder with
+# the hash of its image and a key of the inputs of the script (see
+# inputs_key()) and its value in "keys" (E.g. its timeline values). A frame
+# that is in the checkpoint file already, with an image that still has that
+# hash and the same key, isn't rendered again.
+def _rendered_frames(draw_frame, frames, frame_dir, workers=None, extension="png", scale=1, keys=None, checkpoint_name=CHECKPOINT_NAME, specs=None):
+    paths = [os.path.join(frame_dir, frame_name(frame, extension)) for frame in frames]
+    inputs = inputs_key(draw_frame)
+    keys = {frame: cache_key(inputs, (keys or {}).get(frame)) for frame in frames}
+    checkpoint_path = os.path.join(frame_dir, checkpoint_name)
+    finished = read_json(checkpoint_path, {})
+    done = {path for frame, path in zip(frames, paths) if _is_finished(finished, path, keys[frame])}
+    if done:
+        print(f"Frames: {len(done)} of {len(paths)} finished by an earlier render")
+    rendered = _render_in_order(draw_frame, [(frame, path) for frame, path in zip(frames, paths) if path not in done], workers, scale, specs)
+    for frame, path in zip(frames, paths):
+        if path not in done:
+            next(rendered)
+            finished[os.path.basename(path)] = {"hash": file_hash(path), "key": keys[frame]}
+            write_json(checkpoint_path, finished)
+        yield path
+
+
+def _is_finished(finished, path, key):
+    entry = finished.get(os.path.basename(path))
+    return entry is not None and entry["key"] == key and os.path.exists(path) and file_hash(path) == entry["hash"]
+
+
+# Render every frame in "frames" across a pool of worker processes
+# and save them, in order, to "output" (E.g. "anim-005.mp4")
+#
+# With "stream=True" each finished frame goes straight to ffmpeg, so memory
+# use doesn't grow with the number of frames and a crashed render still
+# leaves the frames it finished in the ".mp4".
+#
+# With "scale" below 1 the frames are rendered smaller for a quick preview
+# (E.g. 0.25 turns 1080×1920 into 270×480), see save_image().
+#
+# With a "frame_key" (E.g. timeline.frame_key) frames with the same key are
+# only rendered once, and the image is used again for the other frames.
+#
+# The frames are rendered into a work folder in the cache (see work_dir()).
+# With "resume=True" a render picks up where the last render of the same
+# output stopped: the frames it finished are checked against their hashes
+# and only the missing ones are rendered, and the ones drawn by an older
+# version of the script or its inputs (or, with a "frame_key", with other
+# values). The folder is deleted when the render worked, unless it resumed.
+#
+# "draw_frame" has to be a function defined at the top level of the script,
+# and the script has to start rendering from an 'if __name__ == "__main__":'
+# block, so that the worker processes can import it without rendering.
+def render_frames(draw_frame, frames, output, workers=None, stream=False, scale=1, frame_key=None, resume=False):
+    frames = list(frames)
+    sources = frame_sources(frames, frame_key)
+    unique = [frame for frame in frames if sources[frame] == frame]
+    if len(unique) < len(frames):
+        print(f"Frames: {len(unique)} of {len(frames)} frames to render, the others repeat them")
+    keys = {frame: frame_key(frame) for frame in unique} if frame_key is not None else None
+    frame_dir = work_dir(output, scale, resume)
+    rendered = _sequence(frames, sources, _rendered_frames(draw_frame, unique, frame_dir, workers, scale=scale, keys=keys))
+    if stream:
+        with FrameEncoder(output) as encoder:
+            for path in rendered:
+                print("Frame:", os.path.basename(path))
+                encoder.write_file(path)
+    else:
+        paths = []
+        for path in rendered:
+            print("Frame:", os.path.basename(path))
+            paths.append(path)
+        assemble_frames(paths, output)
+    _finish_work_dir(frame_dir, resume)
+
+
+# The frames from "start" up to (not including) "end", None for no limit
+def select_frames(frames, frame_range=None):
+    start, end = frame_range or (None, None)
+    return [frame for frame in frames if (start is None or frame >= start) and (end is None or frame < end)]
+
+
+# Render "frames" into the folder "shard_out" instead of an ".mp4", for
+# renatools/shards.py to merge with the other shards of the animation
+#
+# Next to the frame images goes a shard file (E.g. "shard-00000-00025.json")
+# with all frames of the animation, and the image and its hash for each frame
+# of this shard. Shards can be rendered in different processes or on
+# different machines, as long as they write to the same folder.
+def render_shard(draw_frame, frames, shard_out, frame_range=None, workers=None, scale=1, frame_key=None, resume=False):
+    frames = list(frames)
+    selected = select_frames(frames, frame_range)
+    if not selected:
+        raise ValueError(f"No frames in {frame_range}")
+    name = f"shard-{selected[0]:05d}-{selected[-1] + 1:05d}"
+    checkpoint_name = f".{name}-{CHECKPOINT_NAME}"
+    os.makedirs(shard_out, exist_ok=True)
+    if not resume and os.path.exists(os.path.join(shard_out, checkpoint_name)):
+        os.remove(os.path.join(shard_out, checkpoint_name))
+    sources = frame_sources(selected, frame_key)
+    unique = [frame for frame in selected if sources[frame] == frame]
+    keys = {frame: frame_key(frame) for frame in unique} if frame_key is not None else None
+    hashes = {}
+    for path in _rendered_frames(draw_frame, unique, shard_out, workers, scale=scale, keys=keys, checkpoint_name=checkpoint_name):
+        print("Frame:", os.path.basename(path))
+        hashes[os.path.basename(path)] = file_hash(path)
+    shard = {
+        "frames": frames,
+        "images": {str(frame): frame_name(sources[frame]) for frame in selected},
+        "hashes": hashes,
+    }
+    write_json(os.path.join(shard_out, name + ".json"), shard)
+    print("Shard:", os.path.join(shard_out, name + ".json"))
+
+
+# Render an animation with the flags from parse_args(animation=True):
+# the whole animation into "--output", only "--frames", or a shard for
+# "--shard-out"
+def render_animation(draw_frame, frames, args, frame_key=None):
+    frames = list(frames)
+    if args.list_frames:
+        print(json.dumps(frames))
+    elif args.shard_out:
+        render_shard(draw_frame, frames, args.shard_out, args.frames, args.workers, args.scale, frame_key, args.resume)
+    else:
+        frames = select_frames(frames, args.frames)
+        render_frames(draw_frame, frames, args.output, args.workers, args.stream, args.scale, frame_key, args.resume)
+
+
+# Which frame each frame is a copy of: {frame: the first frame with the same
+# "frame_key(frame)"}, without a "frame_key" every frame is its own
+def frame_sources(frames, frame_key=None):
+    first = {}
+    sources = {}
+    for frame in frames:
+        key = frame if frame_key is None else frame_key(frame)
+        sources[frame] = first.setdefault(key, frame)
+    return sources
+
+
+# The image of every frame in order, from the images of the unique frames
+def _sequence(frames, sources, rendered):
+    paths = {}
+    for frame in frames:
+        source = sources[frame]
+        if source == frame:
+            paths[frame] = next(rendered)
+        yield paths[source]
+
+
+# Render every page in "pages" across a pool of worker processes, each into
+# its own PDF, and merge them in order into "output" (E.g. "print-proof-main.pdf")
+#
+# "draw_page(page)" draws one complete page (including the "db.newPage"),
+# the same rules as for render_frames() apply to it, "resume" too.
+# "page_key(page)" gives what is on the page (E.g. its blocks), so pages
+# whose content changed are rendered again by a render that resumes.
+#
+# With "specs" ({page: what is on it}, E.g. the blocks of a print proof page)
+# each worker gets the spec of its page as "draw_page(page, spec)", so the
+# pages are only laid out once, by the script that renders, and not again in
+# every worker that imports it. The spec is also the "page_key".
+def render_pages(draw_page, pages, output, workers=None, resume=False, page_key=None, specs=None):
+    pages = list(pages)
+    if page_key is None and specs is not None:
+        page_key = specs.__getitem__
+    keys = {page: page_key(page) for page in pages} if page_key is not None else None
+    page_dir = work_dir(output, resume=resume)
+    paths = []
+    for path in _rendered_frames(draw_page, pages, page_dir, workers, extension="pdf", keys=keys, specs=specs):
+        print("Page:", os.path.basename(path))
+        paths.append(path)
+    assemble_frames(paths, output)
+    _finish_work_dir(page_dir, resume)
+
+
+# Put rendered frame images together as the pages of one document, or as
+# the frames of an ".mp4"
+def assemble_frames(paths, output):
+    if output.lower().endswith(".mp4"):
+        # Straight to ffmpeg, which takes the frames at any size
+        with FrameEncoder(output) as encoder:
+            for path in paths:
+                encoder.write_file(path)
+        return
+    db.newDrawing()
+    for path in paths:
+        width, height = db.imageSize(path)
+        db.newPage(width, height)
+        db.image(path, (0, 0))
+    db.saveImage(output)
+    db.endDrawing()
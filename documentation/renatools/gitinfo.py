@@ -0,0 +1,204 @@
+# Git metadata for the render scripts, read straight from ".git"
+#
+# The images and proofs print the commit they were made from. Instead of
+# starting a shell and a git process for every value in every script, the
+# hash, short hash, remote URL and dirty state are read from the files in
+# ".git" once. The build driver (renatools/build.py) passes the result on
+# to every script it runs in the RENATOOLS_GIT environment variable, so a
+# whole batch of renders shares one lookup. An index this module can't read
+# (E.g. version 4, from "feature.manyFiles") is left to the git command.
+#
+#   info = git_info()
+#   info["hash"], info["short_hash"], info["remote"], info["dirty"]
+
+import os
+import json
+import struct
+import hashlib
+import functools
+import subprocess
+import configparser
+
+
+ENVIRONMENT_VARIABLE = "RENATOOLS_GIT"
+
+# Same length as "git rev-parse --short" in a repository of this size
+SHORT_HASH_LENGTH = 7
+
+
+# The working tree and ".git" directory of the repository at or above "path"
+def find_repository(path="."):
+    path = os.path.abspath(path)
+    while True:
+        git_path = os.path.join(path, ".git")
+        if os.path.isdir(git_path):
+            return path, git_path
+        if os.path.isfile(git_path):
+            # Worktrees and submodules: ".git" is a file with "gitdir: <path>"
+            with open(git_path, encoding="utf-8") as f:
+                git_dir = f.read().strip().split("gitdir:", 1)[1].strip()
+            return path, os.path.normpath(os.path.join(path, git_dir))
+        parent = os.path.dirname(path)
+        if parent == path:
+            raise FileNotFoundError("Not in a git repository: " + os.path.abspath("."))
+        path = parent
+
+
+# The directory with the refs and config shared by all worktrees
+def _common_dir(git_dir):
+    common_path = os.path.join(git_dir, "commondir")
+    if os.path.exists(common_path):
+        with open(common_path, encoding="utf-8") as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    return git_dir
+
+
+# Resolve a ref (E.g. "refs/heads/main") to a commit hash
+def resolve_ref(git_dir, ref):
+    for folder in (git_dir, _common_dir(git_dir)):
+        ref_path = os.path.join(folder, *ref.split("/"))
+        if os.path.isfile(ref_path):
+            with open(ref_path, encoding="utf-8") as f:
+                value = f.read().strip()
+            if value.startswith("ref: "):
+                return resolve_ref(git_dir, value[5:])
+            return value
+    packed_path = os.path.join(_common_dir(git_dir), "packed-refs")
+    if os.path.exists(packed_path):
+        with open(packed_path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                commit, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return commit
+    return None
+
+
+# The commit hash of HEAD, None in a repository without commits
+def head_commit(git_dir):
+    return resolve_ref(git_dir, "HEAD")
+
+
+# The URL of a remote, like "git remote get-url origin"
+def remote_url(git_dir, remote="origin"):
+    config = configparser.ConfigParser(strict=False, interpolation=None)
+    config.read(os.path.join(_common_dir(git_dir), "config"), encoding="utf-8")
+    section = f'remote "{remote}"'
+    return config.get(section, "url", fallback=None)
+
+
+# The entries of the index (".git/index", versions 2 and 3) as
+# (path, mtime seconds, mtime nanoseconds, size, mode, blob hash, skip)
+def read_index(git_dir):
+    with open(os.path.join(git_dir, "index"), "rb") as f:
+        data = f.read()
+    signature, version, count = struct.unpack_from(">4sII", data)
+    if signature != b"DIRC" or version not in (2, 3):
+        raise ValueError(f"Unsupported git index version: {version}")
+    entries = []
+    offset = 12
+    for _ in range(count):
+        (_, _, mtime, mtime_ns, _, _, mode, _, _, size) = struct.unpack_from(">10I", data, offset)
+        blob = data[offset + 40:offset + 60].hex()
+        (flags,) = struct.unpack_from(">H", data, offset + 60)
+        header = 62
+        skip = bool(flags & 0x8000)  # assume-valid
+        if version == 3 and flags & 0x4000:
+            (extended,) = struct.unpack_from(">H", data, offset + 62)
+            skip = skip or bool(extended & 0x4000)  # skip-worktree
+            header += 2
+        end = data.index(b"\0", offset + header)
+        path = data[offset + header:end].decode("utf-8")
+        # Entries are padded with 1 to 8 NUL bytes to a multiple of 8 bytes
+        offset += (end - offset + 8) & ~7
+        entries.append((path, mtime, mtime_ns, size, mode, blob, skip))
+    return entries
+
+
+def _blob_hash(path):
+    with open(path, "rb") as f:
+        content = f.read()
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+# True when a tracked file in the working tree differs from the index
+# (changes only staged in the index, and untracked files, are not counted)
+def is_dirty(git_dir, work_tree):
+    for path, mtime, mtime_ns, size, mode, blob, skip in read_index(git_dir):
+        # Submodules and files git is told not to look at
+        if skip or mode >> 12 == 0b1110:
+            continue
+        file_path = os.path.join(work_tree, path)
+        try:
+            stat = os.lstat(file_path)
+        except FileNotFoundError:
+            return True
+        if stat.st_size != size:
+            return True
+        if divmod(stat.st_mtime_ns, 1000000000) == (mtime, mtime_ns):
+            continue
+        # The file was touched, compare its contents
+        if os.path.islink(file_path):
+            content_hash = hashlib.sha1(b"blob %d\0" % size + os.readlink(file_path).encode()).hexdigest()
+        else:
+            content_hash = _blob_hash(file_path)
+        if content_hash != blob:
+            return True
+    return False
+
+
+def _info(commit, remote, dirty):
+    return {
+        "hash": commit,
+        "short_hash": commit[:SHORT_HASH_LENGTH] if commit else None,
+        "remote": remote,
+        "dirty": dirty,
+    }
+
+
+# The output of a git command in "work_tree", None when it fails
+def _git(work_tree, *arguments):
+    result = subprocess.run(["git", *arguments], cwd=work_tree, capture_output=True, text=True)
+    return result.stdout.rstrip("\n") if result.returncode == 0 else None
+
+
+# Hash, short hash, remote URL and dirty state from the git command, like
+# read_git_info() gives them
+def read_git_info_with_git(work_tree):
+    status = _git(work_tree, "status", "--porcelain", "--untracked-files=no")
+    return _info(
+        _git(work_tree, "rev-parse", "HEAD"),
+        _git(work_tree, "remote", "get-url", "origin"),
+        # Changes in the working tree, the second column of the status
+        any(line[1] != " " for line in (status or "").splitlines()),
+    )
+
+
+# Hash, short hash, remote URL and dirty state of the repository at "path"
+def read_git_info(path="."):
+    work_tree, git_dir = find_repository(path)
+    try:
+        dirty = is_dirty(git_dir, work_tree)
+    except (OSError, ValueError, struct.error):
+        # No index or one that read_index() can't read, E.g. version 4
+        return read_git_info_with_git(work_tree)
+    return _info(head_commit(git_dir), remote_url(git_dir), dirty)
+
+
+# The git metadata for this build, from the build driver when there is one,
+# otherwise read once per process (and passed on to the worker processes
+# it starts through the environment)
+@functools.lru_cache(maxsize=None)
+def git_info():
+    shared = os.environ.get(ENVIRONMENT_VARIABLE)
+    if shared:
+        return json.loads(shared)
+    info = read_git_info()
+    os.environ[ENVIRONMENT_VARIABLE] = json.dumps(info)
+    return info
+
+
+# The environment for scripts run by the build driver, with the git metadata
+def git_environment():
+    return {**os.environ, ENVIRONMENT_VARIABLE: json.dumps(git_info())}
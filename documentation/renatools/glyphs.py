@@ -0,0 +1,301 @@
+# Fast access to single glyphs, kerning and features of a ".glyphs" source
+#
+# "sources/Rena.glyphs" is a large Glyphs 3 text file, and parsing all of it
+# to look at one glyph or at the kerning takes much longer than the proof
+# scripts need. The file is scanned once (without building any Python objects
+# for its contents) into a small binary index of byte ranges:
+#
+#   - every top-level key (E.g. "kerningLTR", "features", "fontMaster")
+#   - every glyph by its glyph name
+#   - every layer of a glyph by its layerId
+#
+# The index is stored in the cache and reused until the source changes, and
+# only the byte range that is asked for is read and parsed.
+#
+#   source = GlyphsSource("sources/Rena.glyphs")
+#   source.glyph("a")["layers"][0]["width"]
+#   source.layer("a", "m01")
+#   source.kerning()["m01"]["@MMK_L_A"]
+#   source.features()
+
+import os
+import re
+import struct
+
+from renatools.cache import cache_path, cache_key, atomic_write
+
+
+# Bump this when the index format changes
+INDEX_VERSION = 1
+INDEX_MAGIC = b"RGIX"
+
+# Kinds of index entries
+TOP_LEVEL, GLYPH, LAYER = 0, 1, 2
+
+# magic, version, source size, source mtime, number of entries
+_HEADER = struct.Struct("<4sHQqI")
+# kind, parent entry, start, end, name length
+_ENTRY = struct.Struct("<BiIIH")
+
+# Quoted strings (skipped as a whole, so nothing inside them is seen as
+# structure), brackets, and "key = " at the start of a line
+_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}()]|^("(?:[^"\\]|\\.)*"|[A-Za-z0-9_.]+) = ', re.M)
+_VALUE = re.compile(rb'"((?:[^"\\]|\\.)*)"|([^;]*)')
+
+
+# Scan the source into index entries: (kind, parent, start, end, name),
+# "parent" is the index of the glyph entry for layers and -1 otherwise
+def scan(data):
+    entries = []
+    # For every open bracket, the index entry that ends at its closing bracket (or None)
+    stack = []
+    top_level_key = None
+    glyph_key = None
+    glyph = None
+    for match in _TOKENS.finditer(data):
+        token = match.group(0)
+        if token in (b"{", b"("):
+            entry = None
+            if token == b"{" and len(stack) == 2 and top_level_key == "glyphs":
+                glyph = len(entries)
+                entries.append([GLYPH, -1, match.start(), None, ""])
+                entry = glyph
+            elif token == b"{" and len(stack) == 4 and glyph_key == "layers":
+                entry = len(entries)
+                entries.append([LAYER, glyph, match.start(), None, ""])
+            stack.append(entry)
+        elif token in (b"}", b")"):
+            entry = stack.pop()
+            if entry is not None:
+                entries[entry][3] = match.end()
+            if not stack:
+                _close_top_level(entries, match.start())
+        elif match.group(1) is not None:
+            key = _unquote(match.group(1))
+            if len(stack) == 1:
+                # A top-level key runs until the next one (or the end of the root dict)
+                _close_top_level(entries, match.start())
+                top_level_key = key
+                entries.append([TOP_LEVEL, -1, match.start(), None, key])
+            elif len(stack) == 3 and top_level_key == "glyphs":
+                glyph_key = key
+                if key == "glyphname":
+                    entries[glyph][4] = _scalar(data, match.end())
+            elif len(stack) == 5 and glyph_key == "layers" and key == "layerId":
+                entries[-1][4] = _scalar(data, match.end())
+    _close_top_level(entries, len(data))
+    return [tuple(entry) for entry in entries]
+
+
+def _close_top_level(entries, end):
+    for entry in reversed(entries):
+        if entry[0] == TOP_LEVEL:
+            if entry[3] is None:
+                entry[3] = end
+            return
+
+
+def _scalar(data, offset):
+    match = _VALUE.match(data, offset)
+    if match.group(1) is not None:
+        return _unescape(match.group(1).decode("utf-8"))
+    return match.group(2).decode("utf-8").strip()
+
+
+def _unquote(token):
+    token = token.decode("utf-8")
+    if token.startswith('"'):
+        return _unescape(token[1:-1])
+    return token
+
+
+_ESCAPES = re.compile(r'\\(U[0-9A-Fa-f]{4}|[0-7]{1,3}|.)', re.S)
+_ESCAPE_CHARACTERS = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f", "v": "\v"}
+
+
+def _unescape(text):
+    if "\\" not in text:
+        return text
+    return _ESCAPES.sub(_escape_value, text)
+
+
+def _escape_value(match):
+    escape = match.group(1)
+    if escape[0] == "U" and len(escape) == 5:
+        return chr(int(escape[1:], 16))
+    if escape[0] in "01234567":
+        return chr(int(escape, 8))
+    return _ESCAPE_CHARACTERS.get(escape, escape)
+
+
+# Parse the OpenStep plist text of a byte range ("key = value;" statements,
+# or a single "{...}" / "(...)" value) into dicts, lists, strings and numbers
+def parse(text):
+    parser = _Parser(text)
+    if parser.peek() in "{(":
+        return parser.value()
+    return parser.dict_body(end="")
+
+
+class _Parser:
+    _BARE = re.compile(r'[^\s;,=(){}"]+')
+    _STRING = re.compile(r'"((?:[^"\\]|\\.)*)"', re.S)
+    _NUMBER = re.compile(r"-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def peek(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ValueError(f"Expected {character!r} at {self.pos}, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        character = self.peek()
+        if character == "{":
+            self.pos += 1
+            return self.dict_body(end="}")
+        if character == "(":
+            self.pos += 1
+            items = []
+            while self.peek() != ")":
+                items.append(self.value())
+                if self.peek() == ",":
+                    self.pos += 1
+            self.pos += 1
+            return items
+        return self.scalar()
+
+    def dict_body(self, end):
+        result = {}
+        while self.peek() != end:
+            key = self.scalar(convert=False)
+            self.expect("=")
+            result[key] = self.value()
+            self.expect(";")
+        if end:
+            self.pos += 1
+        return result
+
+    def scalar(self, convert=True):
+        self.peek()
+        match = self._STRING.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return _unescape(match.group(1))
+        match = self._BARE.match(self.text, self.pos)
+        if not match:
+            raise ValueError(f"Unexpected {self.peek()!r} at {self.pos}")
+        self.pos = match.end()
+        token = match.group(0)
+        if convert and self._NUMBER.match(token):
+            return float(token) if any(c in token for c in ".eE") else int(token)
+        return token
+
+
+def _write_index(path, stat, entries):
+    def write(temp_path):
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, stat.st_size, stat.st_mtime_ns, len(entries)))
+            for kind, parent, start, end, name in entries:
+                name = name.encode("utf-8")
+                f.write(_ENTRY.pack(kind, parent, start, end, len(name)))
+                f.write(name)
+    atomic_write(path, write)
+
+
+# Read an index, None when it's missing or not for this version of the source
+def _read_index(path, stat):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, size, mtime, count = _HEADER.unpack_from(data)
+    if (magic, version, size, mtime) != (INDEX_MAGIC, INDEX_VERSION, stat.st_size, stat.st_mtime_ns):
+        return None
+    entries = []
+    offset = _HEADER.size
+    for _ in range(count):
+        kind, parent, start, end, length = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size
+        name = data[offset:offset + length].decode("utf-8")
+        offset += length
+        entries.append((kind, parent, start, end, name))
+    return entries
+
+
+# Index of a ".glyphs" file, built on first use and kept in the cache
+def load_index(path):
+    stat = os.stat(path)
+    index_path = cache_path("glyphs", cache_key(os.path.abspath(path)) + ".idx")
+    entries = _read_index(index_path, stat)
+    if entries is None:
+        with open(path, "rb") as f:
+            entries = scan(f.read())
+        _write_index(index_path, stat, entries)
+    return entries
+
+
+class GlyphsSource:
+    def __init__(self, path):
+        self.path = path
+        self.entries = load_index(path)
+        self.top_level = {}
+        self.glyphs = {}
+        self.layer_ranges = {}
+        for number, (kind, parent, start, end, name) in enumerate(self.entries):
+            if kind == TOP_LEVEL:
+                self.top_level[name] = (start, end)
+            elif kind == GLYPH:
+                self.glyphs[name] = (start, end)
+                self.layer_ranges[name] = {}
+            elif kind == LAYER:
+                glyph_name = self.entries[parent][4]
+                self.layer_ranges[glyph_name][name] = (start, end)
+
+    # Read the raw text of a byte range of the source
+    def read(self, start, end):
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode("utf-8")
+
+    def keys(self):
+        return list(self.top_level)
+
+    def glyph_names(self):
+        return list(self.glyphs)
+
+    # A top-level value (E.g. "fontMaster", "axes", "kerningLTR"), or "default"
+    def value(self, key, default=None):
+        if key not in self.top_level:
+            return default
+        return parse(self.read(*self.top_level[key]))[key]
+
+    # A whole glyph, with all of its layers
+    def glyph(self, name):
+        return parse(self.read(*self.glyphs[name]))
+
+    # The layerIds of a glyph, in source order
+    def layer_ids(self, name):
+        return list(self.layer_ranges[name])
+
+    # One layer of a glyph (E.g. source.layer("a", "m01"))
+    def layer(self, name, layer_id):
+        return parse(self.read(*self.layer_ranges[name][layer_id]))
+
+    # Kerning by master id, then left and right glyph or group
+    def kerning(self):
+        return self.value("kerningLTR", self.value("kerning", {}))
+
+    # The feature code as a list of {"tag": ..., "code": ...} dicts
+    def features(self):
+        return self.value("features", [])
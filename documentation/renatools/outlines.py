@@ -0,0 +1,74 @@
+# Cached glyph outlines
+#
+# The animations draw the same few words at a handful of wght values over
+# and over (a ping-pong loop visits every value twice). Shaping the text and
+# instancing the variable font for every frame is the slow part of db.text(),
+# so the text is shaped and outlined once into a BezierPath, kept in an LRU
+# cache keyed on the text, font, size, axis location and features, and every
+# later frame that needs the same instance only draws the path.
+#
+# The cache lives in memory, so it is per process: with render_frames() every
+# worker fills its own, and it only pays off for the frames one worker draws
+# one after the other (E.g. with 8 workers and 50 outlines per text, every
+# outline is still made up to 8 times). Unlike the text boxes of
+# renatools/textlayout.py it isn't kept on disk, an outline is quick enough
+# to make again that reading it back wouldn't save much.
+
+import functools
+
+import drawBot as db
+
+
+# How many outlines to keep around, the animations need about 50 per text
+OUTLINE_CACHE_SIZE = 512
+
+# Axis values are rounded to this many decimals before they are used as a key,
+# so values that only differ by floating point noise share an outline
+AXIS_PRECISION = 2
+
+
+@functools.lru_cache(maxsize=OUTLINE_CACHE_SIZE)
+def _text_path(text, font, fontSize, variations, features, align):
+    fs = db.FormattedString(
+        text,
+        font=font,
+        fontSize=fontSize,
+        fontVariations=dict(variations),
+        openTypeFeatures=dict(features),
+    )
+    path = db.BezierPath()
+    path.text(fs, (0, 0), align=align)
+    return path
+
+
+# Outline of "text" set in "font" at "fontSize", at the axis location
+# "variations" (E.g. {"opsz": 144, "wght": 700}) with the OpenType "features"
+# (E.g. {"dlig": False}). The path starts at (0, 0), like db.text() at (0, 0).
+#
+# The path is shared with every other caller asking for the same outline,
+# so copy it before changing it.
+def text_path(text, font, fontSize, variations=None, features=None, align=None):
+    return _text_path(text, font, fontSize, variation_key(variations), feature_key(features), align)
+
+
+# Axis locations and OpenType features as hashable cache keys
+def variation_key(variations):
+    return tuple(sorted((axis, round(value, AXIS_PRECISION)) for axis, value in (variations or {}).items()))
+
+
+def feature_key(features):
+    return tuple(sorted((features or {}).items()))
+
+
+# Draws "text" at "position" with the current fill and stroke,
+# like db.text() does, from the cached outline
+def draw_text(text, position, font, fontSize, variations=None, features=None, align=None):
+    x, y = position
+    with db.savedState():
+        db.translate(x, y)
+        db.drawPath(text_path(text, font, fontSize, variations, features, align))
+
+
+# Hits, misses and size of the outline cache
+def outline_cache_info():
+    return _text_path.cache_info()
@@ -0,0 +1,88 @@
+# Print proof pages described as data
+#
+# A proof page is a dict with its "section" and a list of "blocks". Each
+# block is set in one style, at one axis location:
+#
+#   {
+#       "location": {"wght": 700, "opsz": 144},       # axis location
+#       "size": 72, "leading": None,                  # font size and line height
+#       "lines": [("ABCDEFGHIJKLMN", (0, 26))],       # db.text() at (x, y)
+#       "boxes": [(BITCOIN, (0, 4, 38, 48))],         # db.textBox() in (x, y, w, h)
+#   }
+#
+# Positions are in grid units from the margin, E.g. (0, 26) is (M+(U*0), M+(U*26)).
+# The text boxes are drawn from the layout cache in renatools/textlayout.py.
+
+import math
+import itertools
+
+import drawBot as db
+
+from renatools.textlayout import draw_text_box, flow_text
+
+
+# Every combination of the axis values, E.g. axis_matrix(wght=(400, 700), opsz=(14, 144))
+# gives the 4 locations from {"wght": 400, "opsz": 14} to {"wght": 700, "opsz": 144}
+def axis_matrix(**axes):
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+# A text block, "location" is a dict of axis values like the ones from axis_matrix()
+def block(location, size, lines=(), boxes=(), leading=None):
+    return {"location": dict(location), "size": size, "leading": leading, "lines": list(lines), "boxes": list(boxes)}
+
+
+# The "wght:700—opsz:144—72pt" style name of a block
+def block_label(location, size=None, leading=None):
+    label = "—".join(f"{axis}:{value}" for axis, value in location.items())
+    if size is not None and leading is not None:
+        label += f"—{size}:{leading}"
+    elif size is not None:
+        label += f"—{size}pt"
+    return label
+
+
+# Pages for "text" flowed through "columns" (x, y, w, h in grid units) on as
+# many pages as it takes, every page gets the "labels" block on top
+def flow_pages(text, columns, font, unit, location, size, leading=None, section=3, labels=None):
+    boxes = itertools.cycle([(0, 0, unit * w, unit * h) for _, _, w, h in columns])
+    frames, overflow = flow_text(text, boxes, font, size, leading, location)
+    if overflow:
+        print("Flow: text left over that didn't fit:", overflow[:80])
+    pages = []
+    for page in range(math.ceil(len(frames) / len(columns))):
+        page_frames = frames[page * len(columns):(page + 1) * len(columns)]
+        boxes = [(frame_text, column) for (_, frame_text), column in zip(page_frames, columns)]
+        blocks = [labels] if labels is not None else []
+        blocks.append(block(location, size, leading=leading, boxes=boxes))
+        pages.append({"section": section, "blocks": blocks})
+    return pages
+
+
+# The pages of several flow_pages() side by side (E.g. the same text at two
+# sizes in two columns), on as many pages as the longest of them needs
+def side_by_side(*flows, section=3, labels=None):
+    pages = []
+    for parts in itertools.zip_longest(*flows):
+        blocks = [labels] if labels is not None else []
+        for part in parts:
+            if part is not None:
+                blocks.extend(part["blocks"])
+        pages.append({"section": section, "blocks": blocks})
+    return pages
+
+
+# Draw the blocks of a page set in "font"
+def draw_blocks(blocks, font, margin, unit):
+    db.font(font)
+    for text_block in blocks:
+        db.fontSize(text_block["size"])
+        if text_block.get("leading") is not None:
+            db.lineHeight(text_block["leading"])
+        db.fontVariations(**text_block["location"])
+        for text, (x, y) in text_block.get("lines", []):
+            db.text(text, (margin + (unit * x), margin + (unit * y)))
+        for text, (x, y, w, h) in text_block.get("boxes", []):
+            box = (margin + (unit * x), margin + (unit * y), unit * w, unit * h)
+            draw_text_box(text, box, font, text_block["size"], text_block.get("leading"), text_block["location"])
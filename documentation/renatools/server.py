@@ -0,0 +1,216 @@
+# Persistent render server for the documentation scripts
+#
+# Every run of a render script starts a new Python process that imports
+# DrawBot, fontTools and NumPy and loads the fonts before it draws anything.
+# The render server does that once and keeps running in the background. The
+# scripts sent to it over a local socket are run in the same warm process,
+# so rendering a still again after changing one coordinate only costs the
+# drawing itself.
+#
+# Run from the root level of the Rena git repository:
+#   $ sh render.sh documentation/images/pre-alpha/wip-010.py
+#   $ sh render.sh documentation/images/pre-alpha/temp/temp.py --output temp.png
+#   $ sh render.sh --stop
+#
+# The first render starts the server. It restarts itself when a font or a
+# renatools module changes, since those stay loaded between renders. The
+# frame and page workers of render_frames() and render_pages() are still new
+# processes, pass "--workers 1" to render an animation in the server itself.
+
+import io
+import os
+import sys
+import glob
+import time
+import runpy
+import secrets
+import argparse
+import importlib
+import traceback
+import contextlib
+import subprocess
+from multiprocessing.connection import Listener, Client, AuthenticationError
+
+from renatools import gitinfo
+from renatools.build import output_path
+from renatools.cache import cache_path
+
+
+SOCKET_PATH = cache_path("render.sock")
+KEY_PATH = cache_path("render.key")
+LOG_PATH = cache_path("render.log")
+
+# Loaded once by the server, it restarts when one of these files changes
+WATCHED_PATTERNS = ("fonts/*.ttf", "fonts/*.otf", "documentation/renatools/*.py")
+
+# Imported before the first render
+WARM_MODULES = (
+    "drawBot",
+    "fontTools.ttLib",
+    "numpy",
+    "pytweening",
+    "renatools.frames",
+    "renatools.fonts",
+    "renatools.outlines",
+    "renatools.textlayout",
+    "renatools.timeline",
+    "renatools.drawing",
+    "renatools.background",
+    "renatools.proof",
+)
+
+# Seconds to wait for a new server to start listening
+START_TIMEOUT = 30
+
+
+def _watched_files():
+    return {path: os.stat(path).st_mtime_ns for pattern in WATCHED_PATTERNS for path in glob.glob(pattern)}
+
+
+# Import the libraries the scripts use and install every font with DrawBot
+def warm_up():
+    for name in WARM_MODULES:
+        with contextlib.suppress(ImportError):
+            importlib.import_module(name)
+    import drawBot as db
+    db.newDrawing()
+    for path in sorted(glob.glob("fonts/*.ttf")):
+        db.font(path)
+    db.endDrawing()
+
+
+# Run a render script like "python <script> <arguments>" does, in this process
+# and in a new drawing, and return whether it worked and what it printed
+def run_script(script, arguments):
+    import drawBot as db
+    output = io.StringIO()
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    sys.argv = [script, *arguments]
+    # A commit since the last render changes the hash the scripts print
+    gitinfo.git_info.cache_clear()
+    os.environ.pop(gitinfo.ENVIRONMENT_VARIABLE, None)
+    ok = True
+    start = time.perf_counter()
+    db.newDrawing()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                runpy.run_path(script, run_name="__main__")
+            except SystemExit as error:
+                ok = error.code in (None, 0)
+            except Exception:
+                traceback.print_exc()
+                ok = False
+    finally:
+        db.endDrawing()
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+    return {"ok": ok, "output": output.getvalue(), "seconds": time.perf_counter() - start}
+
+
+def serve():
+    warm_up()
+    watched = _watched_files()
+    authkey = secrets.token_bytes(32)
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)
+    with Listener(SOCKET_PATH, "AF_UNIX", authkey=authkey) as listener:
+        # Only readable by this user, so only they can send scripts to run
+        handle = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(handle, "wb") as f:
+            f.write(authkey)
+        print("Render server: listening on", SOCKET_PATH, flush=True)
+        while True:
+            try:
+                connection = listener.accept()
+            except AuthenticationError:
+                continue
+            with connection:
+                try:
+                    message = connection.recv()
+                    if message["command"] == "stop" or _watched_files() != watched:
+                        # Stop listening before answering, so the next
+                        # request starts a new server
+                        listener.close()
+                        os.remove(KEY_PATH)
+                        connection.send({"ok": True, "restart": message["command"] != "stop"})
+                        break
+                    print("Render server:", message["script"], flush=True)
+                    connection.send(run_script(message["script"], message["arguments"]))
+                except (OSError, EOFError):
+                    # The client went away
+                    continue
+    print("Render server: stopped", flush=True)
+
+
+# Start a server in the background and wait until it is listening
+def start_server():
+    if os.path.exists(KEY_PATH):
+        os.remove(KEY_PATH)
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, ["documentation", environment.get("PYTHONPATH")]))
+    with open(LOG_PATH, "a") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "renatools.server", "--serve"],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env=environment,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while not os.path.exists(KEY_PATH):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError(f"The render server didn't start, see {LOG_PATH}")
+        time.sleep(0.05)
+    print("Render server: started")
+
+
+# Send a message to the server and return its answer, starting a server
+# first when none is running (unless "start=False")
+def send(message, start=True):
+    while True:
+        try:
+            with open(KEY_PATH, "rb") as f:
+                connection = Client(SOCKET_PATH, "AF_UNIX", authkey=f.read())
+        except (OSError, EOFError, AuthenticationError):
+            if not start:
+                return None
+            start_server()
+            continue
+        with connection:
+            connection.send(message)
+            reply = connection.recv()
+        if not reply.get("restart"):
+            return reply
+        print("Render server: fonts or renatools changed, restarting")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("script", nargs="?", metavar="SCRIPT", help="the render script to run")
+    parser.add_argument("--output", help="where to write the output (default: next to the script, like build-docs.sh)")
+    parser.add_argument("--stop", action="store_true", help="stop the running server")
+    parser.add_argument("--serve", action="store_true", help="run the server in the foreground")
+    args, arguments = parser.parse_known_args()
+    if args.serve:
+        serve()
+        return
+    if args.stop:
+        if send({"command": "stop"}, start=False) is None:
+            print("Render server: not running")
+        else:
+            print("Render server: stopped")
+        return
+    if args.script is None:
+        parser.error("a script to render is needed")
+    output = args.output or output_path(args.script)
+    reply = send({"command": "render", "script": args.script, "arguments": ["--output", output, *arguments]})
+    print(reply["output"], end="")
+    if not reply["ok"]:
+        print("Failed:", args.script)
+        sys.exit(1)
+    print(f"Rendered: {output} in {reply['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Sharded animation renders
+#
+# A long animation can be split into frame ranges ("shards") that are rendered
+# by separate processes, or on separate machines that share a folder, and
+# merged into the ".mp4" once they are all done:
+#
+#   $ python anim-005.py --frames 0:25 --shard-out /Volumes/render/anim-005     (one machine)
+#   $ python anim-005.py --frames 25:49 --shard-out /Volumes/render/anim-005    (another one)
+#   $ sh shards.sh merge /Volumes/render/anim-005 --output anim-005.mp4
+#
+# The coordinator does all of that with local processes:
+#
+#   $ sh shards.sh run documentation/animation/pre-alpha/anim-005/anim-005.py --shards 4
+#   $ sh shards.sh run documentation/animation/pre-alpha/anim-005/anim-005.py --shards 8 \
+#         --shard-out /Volumes/render/anim-005 --dry-run
+#
+# With "--dry-run" it only prints the command for each shard, to start them on
+# the machines of the render pool, and the merge command for when they are done.
+#
+# Every shard writes a shard file with the frames of the whole animation and
+# the hashes of its images (see renatools/frames.py), so the merge can tell
+# when a frame is missing or an image didn't make it to the folder intact.
+
+import os
+import sys
+import glob
+import json
+import shlex
+import argparse
+import subprocess
+
+from renatools.build import output_path
+from renatools.cache import cache_path, cache_key, file_hash, read_json
+from renatools.encoder import FrameEncoder
+
+
+# The frame numbers of an animation script, from its "--list-frames" flag
+def list_frames(script):
+    result = subprocess.run([sys.executable, script, "--list-frames"], capture_output=True, text=True, check=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("["):
+            return json.loads(line)
+    raise ValueError(f"{script} didn't list its frames")
+
+
+# Split the frames into "count" ranges of about the same length, as
+# (start, end) pairs for "--frames START:END"
+def split_frames(frames, count):
+    frames = sorted(frames)
+    count = max(1, min(count, len(frames)))
+    size, extra = divmod(len(frames), count)
+    ranges = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append((frames[start], frames[end - 1] + 1))
+        start = end
+    return ranges
+
+
+def shard_command(script, frame_range, shard_out, arguments=()):
+    start, end = frame_range
+    return [sys.executable, script, "--frames", f"{start}:{end}", "--shard-out", shard_out, *arguments]
+
+
+# Images of every frame in "shard_out" in frame order, checked against the
+# hashes in the shard files
+def merged_frames(shard_out):
+    frames = None
+    images = {}
+    hashes = {}
+    for shard_path in sorted(glob.glob(os.path.join(shard_out, "shard-*.json"))):
+        shard = read_json(shard_path)
+        if frames is not None and shard["frames"] != frames:
+            raise ValueError(f"{shard_path} is from a different version of the animation")
+        frames = shard["frames"]
+        images.update(shard["images"])
+        hashes.update(shard["hashes"])
+    if frames is None:
+        raise FileNotFoundError(f"No shards in {shard_out}")
+    missing = [frame for frame in frames if str(frame) not in images]
+    if missing:
+        raise ValueError(f"{len(missing)} frames are missing, E.g. frame {missing[0]}")
+    paths = []
+    for frame in frames:
+        name = images[str(frame)]
+        path = os.path.join(shard_out, name)
+        if not os.path.exists(path) or file_hash(path) != hashes[name]:
+            raise ValueError(f"The image of frame {frame} ({path}) is missing or damaged")
+        paths.append(path)
+    return paths
+
+
+# Put the frames of all shards in "shard_out" together into "output"
+def merge(shard_out, output):
+    paths = merged_frames(shard_out)
+    if output.endswith(".mp4"):
+        # Only needs ffmpeg, so any machine with the shared folder can merge
+        with FrameEncoder(output) as encoder:
+            for path in paths:
+                encoder.write_file(path)
+    else:
+        from renatools.frames import assemble_frames
+        assemble_frames(paths, output)
+    print(f"Merge: {len(paths)} frames → {output}")
+
+
+# Render "script" in "shards" local processes, then merge the shards into "output"
+def run(script, shards, output=None, shard_out=None, arguments=(), resume=False, dry_run=False):
+    output = output or output_path(script)
+    shard_out = shard_out or os.path.dirname(cache_path("shards", cache_key(os.path.abspath(output)), "shard.json"))
+    ranges = split_frames(list_frames(script), shards)
+    # Share the CPUs between the shards
+    workers = max(1, (os.cpu_count() or 1) // len(ranges))
+    arguments = [*arguments, "--workers", str(workers)] + (["--resume"] if resume else [])
+    commands = [shard_command(script, frame_range, shard_out, arguments) for frame_range in ranges]
+    if dry_run:
+        # For other machines, run from the root level of their copy of the repository
+        for command in commands:
+            print(shlex.join(["python", *command[1:]]))
+        print(shlex.join(["sh", "shards.sh", "merge", shard_out, "--output", output]))
+        return
+    if not resume:
+        # Shards of an earlier split would be merged too
+        for path in glob.glob(os.path.join(shard_out, "shard-*.json")):
+            os.remove(path)
+    processes = [subprocess.Popen(command) for command in commands]
+    failed = [shlex.join(command) for command, process in zip(commands, processes) if process.wait() != 0]
+    if failed:
+        raise RuntimeError("Shards failed (run them again with --resume):\n" + "\n".join(failed))
+    merge(shard_out, output)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="render an animation in shards and merge them")
+    run_parser.add_argument("script", metavar="SCRIPT", help="the animation script")
+    run_parser.add_argument("--shards", type=int, default=os.cpu_count(), help="how many shards to split the frames into")
+    run_parser.add_argument("--output", help="where to write the .mp4 (default: next to the script)")
+    run_parser.add_argument("--shard-out", metavar="DIR", help="the folder for the shards (default: in the cache)")
+    run_parser.add_argument("--resume", action="store_true", help="keep the frames the shards finished last time")
+    run_parser.add_argument("--dry-run", action="store_true", help="only print the commands, to run them on other machines")
+    merge_parser = commands.add_parser("merge", help="merge rendered shards into the .mp4")
+    merge_parser.add_argument("shard_out", metavar="DIR", help="the folder with the shards")
+    merge_parser.add_argument("--output", required=True, help="where to write the .mp4")
+    args, arguments = parser.parse_known_args()
+    if args.command == "run":
+        run(args.script, args.shards, args.output, args.shard_out, arguments, args.resume, args.dry_run)
+    else:
+        merge(args.shard_out, args.output)
+
+
+if __name__ == "__main__":
+    main()
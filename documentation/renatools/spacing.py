@@ -0,0 +1,97 @@
+# Spacing strings for every character of the font
+#
+# Each character is set between the straight and round control characters
+# of its kind: uppercase in "HH?OHO?OO", lowercase in "nn?ono?oo" and figures,
+# punctuation and symbols in "11?010?00". The kind comes from the script of
+# the character: Arabic letters and punctuation are set between alef and waw
+# in "اا?اوا?وو", and Arabic figures in "١١?١٠١?٠٠". The characters of other
+# scripts have no control strings yet and are left out.
+#
+# The characters come from the cmap of the font, in the order of the Glyphs
+# custom filter lists (E.g. "sources/CustomFilter_GF_Latin_All.plist")
+# followed by the rest of the cmap, and are grouped by their kind.
+
+import plistlib
+
+from fontTools import unicodedata
+
+
+# Control strings around each character, by kind
+SPACING_CONTROLS = {
+    "upper": ("HH", "OHO", "OO"),
+    "lower": ("nn", "ono", "oo"),
+    "number": ("11", "010", "00"),
+    "arabic": ("اا", "اوا", "وو"),
+    "arabic-number": ("١١", "١٠١", "٠٠"),
+}
+
+# Scripts set with the Latin control strings, "Zyyy" are the characters
+# shared by all scripts (E.g. figures and punctuation)
+LATIN_SCRIPTS = {"Latn", "Zyyy"}
+
+
+# The kind of spacing string for a character, None for the characters that
+# can't be spaced on their own (combining marks, spaces and controls) and
+# the ones of scripts without control strings
+def character_kind(character):
+    category = unicodedata.category(character)
+    if category[0] not in "LNPS":
+        return None
+    # The extensions, so E.g. the tatweel (Zyyy) is set with the Arabic letters
+    if "Arab" in unicodedata.script_extension(character):
+        return "arabic-number" if category == "Nd" else "arabic"
+    if unicodedata.script(character) not in LATIN_SCRIPTS:
+        return None
+    if category in ("Lu", "Lt"):
+        return "upper"
+    if category[0] == "L":
+        return "lower"
+    return "number"
+
+
+# The glyph name lists of a Glyphs custom filter plist as {list name: [glyph names]}
+def load_glyph_filter(path):
+    with open(path, "rb") as f:
+        return {entry["name"]: entry["list"] for entry in plistlib.load(f)}
+
+
+# Every character in the cmap of "ttFont", the ones in the lists of the
+# filter at "filter_path" first and in their order
+def proof_characters(ttFont, filter_path=None):
+    cmap = ttFont.getBestCmap()
+    by_glyph_name = {}
+    for codepoint, glyph_name in sorted(cmap.items()):
+        by_glyph_name.setdefault(glyph_name, chr(codepoint))
+    characters = []
+    if filter_path is not None:
+        for glyph_names in load_glyph_filter(filter_path).values():
+            characters.extend(by_glyph_name[name] for name in glyph_names if name in by_glyph_name)
+    characters.extend(chr(codepoint) for codepoint in sorted(cmap))
+    # Keep the first place of every character
+    return list(dict.fromkeys(characters))
+
+
+def spacing_string(character, kind):
+    start, middle, end = SPACING_CONTROLS[kind]
+    return start + character + middle + character + end
+
+
+# The spacing strings of "characters" as {kind: [lines]}, in the order
+# of SPACING_CONTROLS
+def spacing_lines(characters):
+    lines = {kind: [] for kind in SPACING_CONTROLS}
+    for character in characters:
+        kind = character_kind(character)
+        if kind is not None:
+            lines[kind].append(spacing_string(character, kind))
+    return lines
+
+
+# Split the lines into texts of "lines_per_column" lines, every kind
+# starting in a new column
+def spacing_columns(lines, lines_per_column):
+    columns = []
+    for kind_lines in lines.values():
+        for start in range(0, len(kind_lines), lines_per_column):
+            columns.append("\n".join(kind_lines[start:start + lines_per_column]) + "\n")
+    return columns
@@ -0,0 +1,202 @@
+# Adaptive sampling of the whole design space of a variable font
+#
+# Proofing a fixed handful of weights misses the places where the
+# interpolation bends: between two masters (or an intermediate layer) the
+# outlines move in a straight line, and they only change direction at the
+# edges of the variation regions in "gvar" and at the "avar" mapping points.
+# The sweep starts from those places on every axis of the "fvar" table, then
+# keeps splitting the steps where the outlines at the midpoint are further
+# than "tolerance" font units from halfway between the outlines at the ends.
+# Near-linear stretches of an axis get few samples, bends get many.
+#
+# The named instances of "fvar" and the locations passed as "include" (E.g.
+# the ones the proof sets without the sweep) are always swept too, and every
+# axis gets at least MIN_AXIS_SAMPLES values. A font with only two masters
+# per axis interpolates in a straight line, so the splitting alone would
+# only give the corners of its design space.
+#
+# The locations are kept in the cache for each version of the font, so
+# running the sweep again (or in every page worker) is free.
+#
+#   locations = sweep_locations("fonts/RenaVF.ttf", text="Hamburgefonstiv", include=[{"wght": 550}])
+#   [{"opsz": 14, "wght": 400}, {"opsz": 14, "wght": 466.75}, ...]
+
+import itertools
+
+from fontTools.ttLib import TTFont
+from fontTools.varLib.models import piecewiseLinearMap
+from fontTools.pens.recordingPen import DecomposingRecordingPen
+
+from renatools.cache import cache_path, cache_key, file_hash, read_json, write_json
+from renatools.proof import axis_matrix
+
+
+# Every axis gets at least this many values, the longest steps between them
+# are split in the middle until it has
+MIN_AXIS_SAMPLES = 3
+
+
+# The axes of the font as {tag: (minimum, default, maximum)} in user space
+def font_axes(font):
+    return {axis.axisTag: (axis.minValue, axis.defaultValue, axis.maxValue) for axis in font["fvar"].axes}
+
+
+# User space value of a normalized (-1 to 1, after "avar") axis value
+def _user_value(font, tag, value):
+    if "avar" in font and font["avar"].segments.get(tag):
+        # Undo the avar mapping
+        segments = font["avar"].segments[tag]
+        value = piecewiseLinearMap(value, {mapped: normalized for normalized, mapped in segments.items()})
+    minimum, default, maximum = font_axes(font)[tag]
+    if value < 0:
+        return default + (value * (default - minimum))
+    return default + (value * (maximum - default))
+
+
+# The values where the outlines can change direction along each axis: the
+# ends of the axis, the default, the start, peak and end of every variation
+# region in "gvar", and the "avar" mapping points
+def axis_breakpoints(font):
+    normalized = {tag: {-1.0, 0.0, 1.0} for tag in font_axes(font)}
+    if "gvar" in font:
+        for variations in font["gvar"].variations.values():
+            for variation in variations:
+                for tag, support in variation.axes.items():
+                    normalized[tag].update(support)
+    if "avar" in font:
+        for tag, segments in font["avar"].segments.items():
+            normalized[tag].update(segments.values())
+    return {
+        tag: sorted({_axis_value(_user_value(font, tag, value)) for value in values if -1 <= value <= 1})
+        for tag, values in normalized.items()
+    }
+
+
+# The values of the named instances in "fvar" on each axis
+def instance_values(font):
+    values = {tag: set() for tag in font_axes(font)}
+    for instance in font["fvar"].instances:
+        for tag, value in instance.coordinates.items():
+            values[tag].add(_axis_value(value))
+    return values
+
+
+# The values of "locations" on each axis of the font, within the axis
+def location_values(font, locations):
+    axes = font_axes(font)
+    values = {tag: set() for tag in axes}
+    for location in locations:
+        for tag, value in location.items():
+            if tag in axes and axes[tag][0] <= value <= axes[tag][2]:
+                values[tag].add(_axis_value(value))
+    return values
+
+
+# Glyph names of the characters of "text", or every glyph in the font
+def sweep_glyphs(font, text=None):
+    if text is None:
+        return font.getGlyphOrder()
+    cmap = font.getBestCmap()
+    return sorted({cmap[ord(character)] for character in text if ord(character) in cmap})
+
+
+# All outline coordinates of "glyph_names" at "location", as one flat list
+def outline_vector(font, glyph_names, location):
+    glyph_set = font.getGlyphSet(location=location)
+    vector = []
+    for name in glyph_names:
+        pen = DecomposingRecordingPen(glyph_set)
+        glyph_set[name].draw(pen)
+        for _, points in pen.value:
+            for point in points:
+                vector.extend(point)
+        vector.append(glyph_set[name].width)
+    return vector
+
+
+# How far (in font units) the outlines at the midpoint are from the
+# straight line between the outlines at "a" and "b"
+def _bend(vector, a, b, middle):
+    start, end, mid = vector(a), vector(b), vector(middle)
+    return max((abs(m - ((s + e) / 2)) for s, e, m in zip(start, end, mid)), default=0)
+
+
+# Axis values as short as they can be written, E.g. 400 instead of 400.0
+def _axis_value(value):
+    value = round(value, 2)
+    return int(value) if float(value).is_integer() else value
+
+
+# Split the steps between "values" of axis "tag" until the outlines between
+# every two neighbouring values are within "tolerance" of a straight line,
+# checked at every location of the other axes in "others"
+#
+# "vector(location)" gives the outline coordinates at a location.
+def refine_axis(vector, tag, values, others, tolerance=1, min_step=1):
+    values = list(values)
+    refined = [values[0]]
+    pending = list(zip(values, values[1:]))[::-1]
+    while pending:
+        a, b = pending.pop()
+        middle = _axis_value((a + b) / 2)
+        if b - a > min_step:
+            bends = (
+                _bend(vector, {**other, tag: a}, {**other, tag: b}, {**other, tag: middle})
+                for other in others
+            )
+            if any(bend > tolerance for bend in bends):
+                # Check both halves, the left one first to keep the values in order
+                pending.append((middle, b))
+                pending.append((a, middle))
+                continue
+        refined.append(b)
+    return refined
+
+
+# "values" with the longest steps split in the middle until there are "count"
+def with_samples(values, count):
+    values = sorted(values)
+    while 1 < len(values) < count:
+        a, b = max(zip(values, values[1:]), key=lambda step: step[1] - step[0])
+        middle = _axis_value((a + b) / 2)
+        if middle in values:
+            break
+        values = sorted([*values, middle])
+    return values
+
+
+# Locations covering the design space of the font at "path": the axis
+# breakpoints, named instances and the values of the "include" locations,
+# refined on every axis, as every combination of the values
+def sweep_locations(path, text=None, tolerance=1, min_step=1, include=(), min_samples=MIN_AXIS_SAMPLES):
+    include = [dict(location) for location in include]
+    locations_path = cache_path("sweep", cache_key(file_hash(path), text, tolerance, min_step, include, min_samples) + ".json")
+    locations = read_json(locations_path)
+    if locations is None:
+        locations = _sweep(path, text, tolerance, min_step, include, min_samples)
+        write_json(locations_path, locations)
+    return locations
+
+
+def _sweep(path, text, tolerance, min_step, include, min_samples):
+    font = TTFont(path)
+    glyph_names = sweep_glyphs(font, text)
+    vectors = {}
+
+    def vector(location):
+        key = tuple(sorted(location.items()))
+        if key not in vectors:
+            vectors[key] = outline_vector(font, glyph_names, location)
+        return vectors[key]
+
+    breakpoints = axis_breakpoints(font)
+    instances = instance_values(font)
+    included = location_values(font, include)
+    axes = {}
+    for tag, values in breakpoints.items():
+        other_tags = [other for other in breakpoints if other != tag]
+        others = [dict(zip(other_tags, combination)) for combination in itertools.product(*(breakpoints[t] for t in other_tags))]
+        values = sorted({*values, *instances[tag], *included[tag]})
+        axes[tag] = with_samples(refine_axis(vector, tag, values, others, tolerance, min_step), min_samples)
+        print("Sweep:", tag, axes[tag])
+    return axis_matrix(**axes)
@@ -0,0 +1,135 @@
+# Cached text box layout
+#
+# The proofs set the same long paragraphs (E.g. BITCOIN*2) in the same boxes
+# on several pages, and again on every rebuild. Breaking a paragraph into
+# lines and shaping it is by far the slowest part of those pages, so the
+# laid out text box is kept as outlines:
+#
+#   - in memory, as a BezierPath, for the pages drawn by the same process
+#   - on disk, as the recorded pen calls of the path, for the other page
+#     workers and the next build
+#
+# Both are keyed on the text, box size, font (and its file hash), size,
+# leading, axis location, features and alignment.
+#
+# The boxes are drawn as outlines, so the text in the PDFs made with
+# draw_text_box() can't be selected or searched.
+
+import os
+import re
+import functools
+
+import drawBot as db
+from fontTools.pens.recordingPen import RecordingPen, replayRecording
+
+from renatools.cache import cache_path, cache_key, file_hash, read_json, write_json
+from renatools.outlines import variation_key, feature_key
+
+
+# How many laid out text boxes to keep in memory
+LAYOUT_CACHE_SIZE = 64
+
+# Bump this to throw away the cached layouts
+CACHE_VERSION = 1
+
+# flow_text() first lays out this many characters for every em × line height
+# of a box, about one and a half times what fits in it
+FLOW_CHUNK_SIZE = 3
+
+_WHITESPACE = re.compile(r"\s")
+
+
+# Hash of a font file, or the font name for installed fonts (E.g. "Helvetica")
+@functools.lru_cache(maxsize=None)
+def _font_hash(font, mtime):
+    return file_hash(font) if mtime is not None else font
+
+
+def _font_key(font):
+    mtime = os.stat(font).st_mtime_ns if os.path.exists(font) else None
+    return _font_hash(font, mtime)
+
+
+def _formatted_string(text, font, fontSize, leading, variations, features):
+    attributes = dict(font=font, fontSize=fontSize, fontVariations=dict(variations), openTypeFeatures=dict(features))
+    if leading is not None:
+        attributes["lineHeight"] = leading
+    return db.FormattedString(text, **attributes)
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _text_box_path(text, width, height, font, fontSize, leading, variations, features, align):
+    key = cache_key(CACHE_VERSION, text, width, height, _font_key(font), fontSize, leading, variations, features, align)
+    layout_path = cache_path("layout", key + ".json")
+    layout = read_json(layout_path)
+    path = db.BezierPath()
+    if layout is not None:
+        replayRecording(layout["path"], path)
+        return path, layout["overflow"]
+    fs = _formatted_string(text, font, fontSize, leading, variations, features)
+    overflow = path.textBox(fs, (0, 0, width, height), align=align)
+    pen = RecordingPen()
+    path.drawToPen(pen)
+    overflow = str(overflow) if overflow else ""
+    write_json(layout_path, {"path": pen.value, "overflow": overflow})
+    return path, overflow
+
+
+# Outlines of "text" laid out in a box of "width" × "height" at (0, 0),
+# and the text that didn't fit in the box
+#
+# The path is shared with every other caller asking for the same layout,
+# so copy it before changing it.
+def text_box_path(text, width, height, font, fontSize, leading=None, variations=None, features=None, align=None):
+    return _text_box_path(text, width, height, font, fontSize, leading, variation_key(variations), feature_key(features), align)
+
+
+# Draws "text" in "box" (x, y, w, h) with the current fill and stroke, like
+# db.textBox() does, from the cached layout, and returns the text that didn't fit
+def draw_text_box(text, box, font, fontSize, leading=None, variations=None, features=None, align=None):
+    x, y, width, height = box
+    path, overflow = text_box_path(text, width, height, font, fontSize, leading, variations, features, align)
+    with db.savedState():
+        db.translate(x, y)
+        db.drawPath(path)
+    return overflow
+
+
+# The start of "text", at least "length" characters long and ending after a
+# space or line break, so the lines of a box that overflows break like they
+# would in the whole text
+def _text_chunk(text, length):
+    match = _WHITESPACE.search(text, length)
+    return text[:match.end()] if match else text
+
+
+# Flow "text" through "boxes" (any iterable of (x, y, w, h), it can go on
+# forever), filling each box before moving on to the next
+#
+# Returns the boxes that got text as (box, text) pairs, and the text that
+# didn't fit in any of them. Each box is given a chunk of the text a bit
+# longer than what fits in it by its size, and a chunk twice as long while
+# the box isn't full, so a long text isn't laid out again for every box.
+# Drawing each pair with draw_text_box() reuses the layout made here.
+def flow_text(text, boxes, font, fontSize, leading=None, variations=None, features=None, align=None):
+    frames = []
+    remaining = text
+    for box in boxes:
+        if not remaining.strip():
+            remaining = ""
+            break
+        _, _, width, height = box
+        length = max(1, int(FLOW_CHUNK_SIZE * width * height / (fontSize * (leading or fontSize))))
+        while True:
+            chunk = _text_chunk(remaining, length)
+            _, overflow = text_box_path(chunk, width, height, font, fontSize, leading, variations, features, align)
+            if overflow or chunk == remaining:
+                break
+            length *= 2
+        if overflow == chunk:
+            # Nothing fits in this box, so nothing will fit in the next ones either
+            break
+        frames.append((box, chunk))
+        remaining = overflow + remaining[len(chunk):]
+    print(f"Flow: {len(text)} characters in {len(frames)} boxes, {len(remaining)} left over")
+    return frames, remaining
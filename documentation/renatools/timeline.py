@@ -0,0 +1,87 @@
+# Precomputed animation timelines
+#
+# Instead of working out the easing for every frame while drawing it, a
+# Timeline evaluates each animated value (position, wght, ...) for all frames
+# at once as a NumPy array. A frame then only looks up its own values by
+# index, so frames can be drawn in any order, in any process.
+#
+#   timeline = Timeline.loop(F-1, 0.02)
+#   timeline.add("ypos", "easeInOutExpo", 1035, 1440, wave=sin_loop)
+#   timeline.add("wght", "easeInOutQuart", 400, 700, wave=sin_loop, snap=(699, 700))
+#   ypos, varWght = timeline.values(frame, "ypos", "wght")
+#
+# Frames with the same values look the same (sin_loop() and the ping-pong
+# loops go back over the values of the first half of the loop), so
+# timeline.frame_key can be passed to render_frames() to draw them only once.
+
+import numpy as np
+
+from renatools.easing import EASING, remap
+
+
+# Values closer than this many decimals count as the same in frame_key()
+FRAME_KEY_PRECISION = 3
+
+
+class Timeline:
+    # "steps" is the time value of every frame, what used to be "step"
+    def __init__(self, steps):
+        self.steps = np.asarray(steps, dtype=float)
+        self.tracks = {}
+
+    # Steps for loops that advance by "increment" every frame
+    # (the same values as renatools.frames.loop_step())
+    @classmethod
+    def loop(cls, frames, increment=0.02, offset=0):
+        return cls(offset + (np.arange(frames) * increment))
+
+    # Steps for loops that run 0 → 1 and back to 0
+    # (the same values as renatools.frames.ping_pong_step())
+    @classmethod
+    def ping_pong(cls, frames, increment=0.04):
+        steps = (np.arange(frames) * increment) % 2
+        return cls(np.where(steps > 1, 2 - steps, steps))
+
+    def __len__(self):
+        return len(self.steps)
+
+    # Add an animated value to the timeline:
+    #
+    # - "wave" shapes the steps first (E.g. sin_loop or t_sin), None uses them as they are
+    # - "easing" is the name of a pytweening curve (see renatools.easing.EASING)
+    # - the eased 0–1 values are remapped to outputMin–outputMax
+    # - "snap=(699, 700)" sets every value at or above 699 to 700
+    # - "offsets" gives a row of values per frame, one for each offset added to
+    #   the step (E.g. one wght per line of a stack of text)
+    def add(self, name, easing, outputMin, outputMax, wave=None, snap=None, offsets=None):
+        steps = self.steps
+        if offsets is not None:
+            steps = steps[:, np.newaxis] + np.asarray(offsets, dtype=float)
+        if wave is not None:
+            steps = wave(steps)
+        values = remap(EASING[easing](steps), 0, 1, outputMin, outputMax)
+        if snap is not None:
+            threshold, value = snap
+            values = np.where(values >= threshold, value, values)
+        self.tracks[name] = values
+        return values
+
+    # The values of "names" at "frame", as plain Python numbers (or lists of
+    # numbers for values with "offsets")
+    def values(self, frame, *names):
+        values = [self.tracks[name][frame].tolist() for name in names]
+        if len(values) == 1:
+            return values[0]
+        return values
+
+    # The time value of "frame"
+    def step(self, frame):
+        return float(self.steps[frame])
+
+    # The values of every track at "frame", rounded to "precision" decimals,
+    # frames with the same key are drawn the same
+    def frame_key(self, frame, precision=FRAME_KEY_PRECISION):
+        return tuple(
+            (name, tuple(np.atleast_1d(np.round(values[frame], precision)).tolist()))
+            for name, values in sorted(self.tracks.items())
+        )
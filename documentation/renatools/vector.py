@@ -0,0 +1,189 @@
+# Vector export of the animations
+#
+# The animations move a few lines of the variable font around and sweep its
+# axes, so instead of a ".mp4" of every frame they can be written as one SVG
+# with CSS animations: the text is live text in the web font (E.g.
+# "fonts/RenaVF.woff2"), its position is a "transform" keyframe animation and
+# its axis location a "font-variation-settings" one. The parts of the frame
+# that don't move are drawn once, by DrawBot, into an SVG that sits behind the
+# text. The file is a few kilobytes and plays at any size in a browser.
+#
+# Only the keyframes that the easing needs are kept: the values of every
+# frame come from the Timeline, and a frame is left out when the straight
+# line between the keyframes around it is within "tolerance" of its value
+# (the CSS animations run linearly from keyframe to keyframe).
+#
+#   texts = [vector_text("Rena", "xpos", 1635, 190, "fonts/RenaVF.woff2", variations={"wght": "wght"})]
+#   export_svg("anim-005.svg", timeline, 1080, 1920, texts, static=draw_static)
+
+import os
+import base64
+import tempfile
+from xml.sax.saxutils import escape, quoteattr
+
+import drawBot as db
+
+
+# Frames per second, the same as DrawBot's ".mp4" frames and renatools/encoder.py
+FRAME_RATE = 10
+
+# How far (in points, or axis units) the animation may be from the value of
+# a frame that isn't a keyframe
+KEYFRAME_TOLERANCE = 0.5
+
+TEXT_ANCHORS = {None: "start", "left": "start", "center": "middle", "right": "end"}
+
+
+# A line of text for export_svg(), drawn like db.text(text, (x, y)) at "fontSize"
+#
+# "x", "y" and the values of "variations" are numbers, names of timeline
+# tracks (E.g. "xpos") or, for tracks with "offsets", (name, column) pairs.
+# "fill" is a DrawBot color: a gray value or an (r, g, b) or (r, g, b, a) tuple.
+def vector_text(text, x, y, fontSize, font, fill=0, align=None, variations=None, features=None):
+    return {
+        "text": text,
+        "position": (x, y),
+        "fontSize": fontSize,
+        "font": font,
+        "fill": fill,
+        "align": align,
+        "variations": dict(variations or {}),
+        "features": dict(features or {}),
+    }
+
+
+# The value of every frame, for a number or a timeline track
+def _track(timeline, value):
+    if isinstance(value, (int, float)):
+        return [value] * len(timeline)
+    if isinstance(value, tuple):
+        name, column = value
+        return timeline.tracks[name][:, column].tolist()
+    return timeline.tracks[value].tolist()
+
+
+# Which of the points to keep so that going in a straight line from kept point
+# to kept point stays within "tolerance" of every point in between. Each point
+# is a tuple of values (E.g. (x, y)), checked one by one.
+def keyframe_indices(points, tolerance=KEYFRAME_TOLERANCE):
+    keep = {0, len(points) - 1}
+    pending = [(0, len(points) - 1)]
+    while pending:
+        a, b = pending.pop()
+        if b - a < 2:
+            continue
+        worst, worst_index = 0, None
+        for index in range(a + 1, b):
+            t = (index - a) / (b - a)
+            distance = max(abs(p - (pa + ((pb - pa) * t))) for p, pa, pb in zip(points[index], points[a], points[b]))
+            if distance > worst:
+                worst, worst_index = distance, index
+        if worst > tolerance:
+            keep.add(worst_index)
+            pending += [(a, worst_index), (worst_index, b)]
+    return sorted(keep)
+
+
+def _number(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _css_color(fill):
+    if not isinstance(fill, tuple):
+        fill = (fill, fill, fill)
+    r, g, b, *alpha = fill
+    channels = ", ".join(_number(channel * 100) + "%" for channel in (r, g, b))
+    return f"rgba({channels}, {_number(alpha[0] if alpha else 1)})"
+
+
+# A CSS keyframe animation of "css(point)" for the points of every frame,
+# the animation loops back to the first frame after the last one
+def _keyframes(name, points, css, tolerance):
+    # The first frame again at 100%, where the loop starts over
+    points = [tuple(point) for point in points] + [tuple(points[0])]
+    steps = []
+    for index in keyframe_indices(points, tolerance):
+        steps.append(f"  {_number(index / (len(points) - 1) * 100)}% {{ {css(points[index])} }}")
+    return f"@keyframes {name} {{\n" + "\n".join(steps) + "\n}"
+
+
+# The frame of "draw_static()" (see renatools/background.py) as an SVG data URL
+def _static_svg(draw_static, width, height):
+    folder = tempfile.mkdtemp(prefix="rena-svg-")
+    path = os.path.join(folder, "static.svg")
+    try:
+        db.newDrawing()
+        db.newPage(width, height)
+        draw_static()
+        db.saveImage(path)
+        db.endDrawing()
+        with open(path, "rb") as f:
+            return "data:image/svg+xml;base64," + base64.b64encode(f.read()).decode("ascii")
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        os.rmdir(folder)
+
+
+# Write the timeline as an animated SVG of "width" × "height" to "path"
+#
+# "texts" are made by vector_text(), "static" draws the frame behind them (on
+# the current page, like draw_static_plate() uses it). The font URLs are made
+# relative to the SVG, so keep the SVG where it can reach "fonts/".
+def export_svg(path, timeline, width, height, texts, static=None, tolerance=KEYFRAME_TOLERANCE):
+    duration = len(timeline) / FRAME_RATE
+    folder = os.path.dirname(os.path.abspath(path))
+    styles = []
+    for font in sorted({text["font"] for text in texts}):
+        family = os.path.splitext(os.path.basename(font))[0]
+        url = os.path.relpath(os.path.abspath(font), folder).replace(os.sep, "/")
+        styles.append(f'@font-face {{ font-family: "{family}"; src: url("{url}") format("woff2"); }}')
+    elements = []
+    for number, text in enumerate(texts):
+        name = f"text-{number}"
+        x, y = (_track(timeline, value) for value in text["position"])
+        axes = sorted(text["variations"])
+        locations = list(zip(*(_track(timeline, text["variations"][axis]) for axis in axes))) if axes else []
+        features = ", ".join(f'"{tag}" {int(value)}' for tag, value in sorted(text["features"].items()))
+        animations = [f"{name}-position {_number(duration)}s linear infinite"]
+        styles.append(_keyframes(
+            f"{name}-position",
+            # SVG measures y from the top of the page, DrawBot from the bottom
+            list(zip(x, (height - value for value in y))),
+            lambda point: f"transform: translate({_number(point[0])}px, {_number(point[1])}px);",
+            tolerance,
+        ))
+        if locations:
+            animations.append(f"{name}-variations {_number(duration)}s linear infinite")
+            styles.append(_keyframes(
+                f"{name}-variations",
+                locations,
+                lambda point: "font-variation-settings: " + ", ".join(f'"{axis}" {_number(value)}' for axis, value in zip(axes, point)) + ";",
+                tolerance,
+            ))
+        declarations = [
+            f'font-family: "{os.path.splitext(os.path.basename(text["font"]))[0]}"',
+            f"font-size: {_number(text['fontSize'])}px",
+            f"fill: {_css_color(text['fill'])}",
+            f"text-anchor: {TEXT_ANCHORS[text['align']]}",
+            "white-space: pre",
+            f"animation: {', '.join(animations)}",
+        ]
+        if features:
+            declarations.append(f"font-feature-settings: {features}")
+        styles.append(f".{name} {{ {'; '.join(declarations)}; }}")
+        elements.append(f'<text class="{name}">{escape(text["text"])}</text>')
+    if static is not None:
+        elements.insert(0, f'<image width="{width}" height="{height}" href={quoteattr(_static_svg(static, width, height))}/>')
+    document = "\n".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        "<style>",
+        *styles,
+        "</style>",
+        *elements,
+        "</svg>",
+        "",
+    ])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document)
+    print(f"SVG: {len(timeline)} frames → {path} ({len(document.encode('utf-8')) // 1024} KB)")
@@ -0,0 +1,118 @@
+# Watch mode: render a script again every time it or one of its inputs changes
+#
+# The script, the fonts in "fonts/" and every other file the script depends
+# on (the inputs renatools/build.py finds: the font and image paths in the
+# script and the renatools modules it imports) are checked a few times a
+# second. After a change the script is rendered by the render server (see
+# renatools/server.py), which has the libraries, fonts and caches loaded
+# already, so the new image is there well within a second.
+#
+# The image is rendered to a temporary file next to it and then moved into
+# place, so an image viewer never shows a half written file, and a render
+# that fails (E.g. a typo in the script) leaves the last good image.
+#
+# Run from the root level of the Rena git repository:
+#   $ sh watch.sh documentation/images/pre-alpha/wip-010.py
+#   $ sh watch.sh documentation/images/pre-alpha/temp/temp.py --output temp.png
+
+import os
+import glob
+import time
+import argparse
+
+from renatools.build import output_path, script_inputs
+from renatools.server import send
+
+
+# The fonts are watched for every script, they are rebuilt by build-font.sh
+FONT_PATTERN = "fonts/*.ttf"
+
+# Seconds between two looks at the files
+WATCH_INTERVAL = 0.2
+
+
+# Every file to watch for "script"
+def watched_paths(script):
+    return sorted({script, *script_inputs(script), *glob.glob(FONT_PATTERN)})
+
+
+# Modification time and size of every file, None for missing files
+def _snapshot(paths):
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            snapshot[path] = None
+    return snapshot
+
+
+# Render "script" to "output" with the render server, the output is only
+# replaced when the render worked
+def render_atomic(script, output, arguments=()):
+    # Not made with tempfile.mkstemp(), DrawBot creates the file itself
+    # so it gets the usual permissions
+    folder, name = os.path.split(output)
+    temp_path = os.path.join(folder, f".tmp-{os.getpid()}-{name}")
+    try:
+        reply = send({"command": "render", "script": script, "arguments": ["--output", temp_path, *arguments]})
+        if reply["ok"]:
+            os.replace(temp_path, output)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return reply
+
+
+# Wait until one of "paths" changed and the files stopped changing
+# (editors and fontmake write in more than one step), return the changed paths
+def wait_for_change(paths, interval=WATCH_INTERVAL):
+    snapshot = _snapshot(paths)
+    current = snapshot
+    while current == snapshot:
+        time.sleep(interval)
+        current = _snapshot(paths)
+    while True:
+        time.sleep(interval)
+        settled = _snapshot(paths)
+        if settled == current:
+            break
+        current = settled
+    return [path for path in paths if current[path] != snapshot[path]]
+
+
+def watch(script, output, arguments=(), interval=WATCH_INTERVAL):
+    paths = [script]
+    while True:
+        try:
+            paths = watched_paths(script)
+        except SyntaxError:
+            # Keep watching the files of the last version that could be read
+            pass
+        reply = render_atomic(script, output, arguments)
+        print(reply["output"], end="")
+        if reply["ok"]:
+            print(f"Watch: rendered {output} in {reply['seconds']:.2f}s")
+        else:
+            print(f"Watch: {script} failed, {output} is unchanged")
+        changed = wait_for_change(paths, interval)
+        print("Watch: changed", ", ".join(changed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("script", metavar="SCRIPT", help="the render script to watch")
+    parser.add_argument("--output", help="where to write the output (default: next to the script, like build-docs.sh)")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="seconds between two looks at the files")
+    args, arguments = parser.parse_known_args()
+    output = args.output or output_path(args.script)
+    print(f"Watch: {args.script} → {output}, stop with Ctrl-C")
+    try:
+        watch(args.script, output, arguments, args.interval)
+    except KeyboardInterrupt:
+        print()
+
+
+if __name__ == "__main__":
+    main()
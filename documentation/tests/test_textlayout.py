@@ -0,0 +1,60 @@
+# Run from the root level of the Rena git repository:
+#   $ python -m pytest documentation/tests
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("drawBot")
+
+from fontTools.pens.recordingPen import RecordingPen
+
+from renatools import textlayout
+
+
+FONT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "fonts", "RenaVF.ttf"))
+
+TEXT = "Rena is a variable typeface for the screen and for print. " * 20
+
+
+def _recording(path):
+    pen = RecordingPen()
+    path.drawToPen(pen)
+    return pen.value
+
+
+# The same box laid out cold and then from the layout on disk
+def test_text_box_from_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    textlayout._text_box_path.cache_clear()
+    cold_path, cold_overflow = textlayout.text_box_path(TEXT, 300, 200, FONT_PATH, 12, variations={"wght": 500})
+    # Only the copy on disk is left
+    textlayout._text_box_path.cache_clear()
+    cached_path, cached_overflow = textlayout.text_box_path(TEXT, 300, 200, FONT_PATH, 12, variations={"wght": 500})
+    assert os.listdir(os.path.join(".cache", "renatools", "layout"))
+    assert cached_overflow == cold_overflow
+    assert cold_overflow
+    assert _recording(cached_path) == _recording(cold_path)
+
+
+# A long text flowed through many boxes is laid out about once, not again
+# for every box
+def test_flow_text_lays_out_chunks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    textlayout._text_box_path.cache_clear()
+    laid_out = []
+    original = textlayout.text_box_path
+
+    def text_box_path(text, *args):
+        laid_out.append(text)
+        return original(text, *args)
+
+    monkeypatch.setattr(textlayout, "text_box_path", text_box_path)
+    text = TEXT * 10
+    frames, remaining = textlayout.flow_text(text, [(0, 0, 300, 200)] * 1000, FONT_PATH, 12)
+    assert not remaining
+    assert len(frames) > 10
+    assert sum(len(chunk) for chunk in laid_out) < 4 * len(text)
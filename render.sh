@@ -0,0 +1 @@
+PYTHONPATH=documentation python -m renatools.server "$@"